@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import random
+import time
+
+# 二元乘法微基准：比较 dict 双重循环与 Kronecker 代换
+# - 高位分解模型 F^m（m ≤ 8，以及更大的 m）的 (F^m)·(F^m)：系数大小悬殊、一半槽位为空
+# - 系数位数均匀的稠密 (d+1)×(d+1) 项多项式自乘：决定 bivar.mul 的分派阈值
+# 用法：python -m benchmarks.bench_bivar_mul
+from coppersmith.bivar import Bivar, mul_dict, mul_kronecker, pow_bivar
+
+
+def _compare(a: Bivar, b: Bivar, row: dict[str, object]) -> None:
+    results = []
+    for name, fn in (("dict", mul_dict), ("kronecker", mul_kronecker)):
+        t0 = time.perf_counter()
+        results.append(fn(a, b))
+        row[name] = round(time.perf_counter() - t0, 5)
+    row["agree"] = results[0] == results[1]
+    print(row)
+
+
+def main() -> None:
+    random.seed(10)
+    for bits in (16, 256, 1024):
+        # 高位分解模型 F(x,y) = xy + q0 x + p0 y + c
+        F: Bivar = {
+            (1, 1): 1,
+            (1, 0): random.getrandbits(bits),
+            (0, 1): random.getrandbits(bits),
+            (0, 0): -random.getrandbits(2 * bits),
+        }
+        for m in (1, 2, 3, 4, 6, 8, 12):
+            A = pow_bivar(F, m)
+            _compare(A, A, {"model": "F^m", "bits": bits, "m": m, "terms": len(A)})
+    for bits in (8, 64, 128, 256):
+        for d in (3, 5, 8, 12):
+            D: Bivar = {
+                (i, j): random.getrandbits(bits) - (1 << (bits - 1))
+                for i in range(d + 1)
+                for j in range(d + 1)
+            }
+            _compare(D, D, {"model": "dense", "bits": bits, "terms": len(D)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import random
+import time
+
+# 约化强度基准：LLL（fp）/ 深插入 LLL / BKZ-lite 在临界 X 下的成功率与耗时
+# 对每个 X，按格维度 n = 3m + t 从小到大尝试，报告各后端“全部实例成功”的最小维度及其耗时，
+# 用于判断“小格 + 强约化”何时比“大格 + LLL”更划算（交叉点）。
+# 用法：python -m benchmarks.bench_reduction
+from coppersmith.univariate import find_small_roots_univariate
+
+BACKENDS = ("fp", "deep", "bkz")
+PARAMS = [(2, 1), (2, 2), (3, 1), (3, 2), (4, 1), (4, 2)]
+INSTANCES = 4
+
+
+def make_instances(N: int, X: int, count: int) -> list[tuple[int, list[int]]]:
+    out = []
+    for _ in range(count):
+        r = random.randrange(X // 2, X)
+        a, b = random.randrange(N), random.randrange(N)
+        out.append((r, [(-(r**3 + a * r * r + b * r)) % N, b, a, 1]))
+    return out
+
+
+def main() -> None:
+    random.seed(31)
+    N = random.getrandbits(64) | 1
+    for Xbits in (15, 16, 17, 18):
+        X = 1 << Xbits
+        insts = make_instances(N, X, INSTANCES)
+        row: dict[str, object] = {"Xbits": Xbits}
+        for backend in BACKENDS:
+            for m, t in PARAMS:
+                t0 = time.perf_counter()
+                ok = sum(r in find_small_roots_univariate(f, N, X, m, t, backend) for r, f in insts)
+                ms = (time.perf_counter() - t0) * 1000 / len(insts)
+                if ok == len(insts):
+                    row[backend] = {"dim": 3 * m + t, "m": m, "t": t, "ms": round(ms, 1)}
+                    break
+            else:
+                row[backend] = None
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import random
+import time
+from fractions import Fraction
+
+# 结果式基准：比较插值法 / 多模 CRT / 子结果式 PRS 在不同次数下的耗时
+# 用法：python -m benchmarks.bench_resultant
+from coppersmith.elimination import RESULTANT_METHODS, BivarFrac
+
+
+def rand_bivar_frac(dx: int, dy: int, bits: int) -> BivarFrac:
+    return {
+        (i, j): Fraction(random.getrandbits(bits) - (1 << (bits - 1)), random.randint(1, 8))
+        for i in range(dx + 1)
+        for j in range(dy + 1)
+    }
+
+
+def main() -> None:
+    random.seed(19)
+    for bits in (8, 64):
+        for deg in (1, 2, 3, 4, 5, 6):
+            G1 = rand_bivar_frac(deg, deg, bits)
+            G2 = rand_bivar_frac(deg, deg, bits)
+            # 插值法需要 deg_bound+1 个采样点，位于 [-X-3, X+3]
+            X = deg * deg * 2
+            row: dict[str, object] = {"bits": bits, "deg": deg}
+            results = []
+            for name, fn in RESULTANT_METHODS.items():
+                t0 = time.perf_counter()
+                R = fn(G1, G2, X, X)
+                row[name] = round(time.perf_counter() - t0, 4)
+                results.append(R)
+            # 各方法结果只差符号
+            row["agree"] = all(R == results[0] or R == [-c for c in results[0]] for R in results)
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
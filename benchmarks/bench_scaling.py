@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+
+# 规模化基准与回归检查：分别对格构造、LLL、结果式、根提取，在 N 位数（64–2048）、
+# 多项式次数、格维度与后端上取点计时。
+# - 每轮先测一段与本包无关的纯 Python 大整数负载（校准），紧接着测用例（快的调用在一轮内
+#   重复多次，计时期间关闭 GC），取两者之比；REPEATS 轮取中位数，得到与机器速度基本无关的
+#   “校准单位”
+# - 基线文件 baseline_scaling.json 带版本号；--check 时逐项比较，比基线慢超过
+#   (1 + tolerance) 倍即记为回归，退出码 1；--update 重写基线
+# - --quick 只跑小规模子集（tests/test_perf.py 使用）
+# 用法：
+#   python -m benchmarks.bench_scaling                  # 打印全部用例
+#   python -m benchmarks.bench_scaling --check          # 与基线比较
+#   python -m benchmarks.bench_scaling --update         # 重新生成基线
+from coppersmith.elimination import BivarFrac, resultant_in_x
+from coppersmith.lll import howgrave_graham_bound2, reduce_basis, stop_when_short
+from coppersmith.poly import from_coeffs
+from coppersmith.univariate import (
+    _build_lattice,
+    construct_lattice,
+    extract_roots,
+    precheck_univariate,
+)
+
+BASELINE_VERSION = 1
+BASELINE_PATH = Path(__file__).with_name("baseline_scaling.json")
+REPEATS = 5
+MIN_ROUND = 0.02  # 单轮计时下限（秒），更快的调用在一轮内重复多次
+# 选取 X：预检余量（比特）不低于此值的最大 2 的幂，即接近可解边界的实际参数
+X_MARGIN_BITS = 4
+DEFAULT_TOLERANCE = 0.5
+
+N_BITS = (64, 256, 1024, 2048)
+# 单变量形状 (n_bits, 次数 d, m, t)，格维度 d·m + t。三条扫描线：
+#   N 位数（d=2, m=2, t=1）、次数（256 位, m=2, t=1）、维度（64 位, d=3）
+SHAPES = tuple(
+    dict.fromkeys(
+        [(nb, 2, 2, 1) for nb in N_BITS]
+        + [(256, d, 2, 1) for d in (1, 2, 3, 4)]
+        + [(64, 3, m, t) for m, t in ((1, 1), (2, 2), (3, 2), (4, 2))]
+    )
+)
+LLL_BACKENDS = ("int", "fp")
+RESULTANT_METHODS = ("modular", "interpolation", "subresultant")
+# 结果式形状 (G1/G2 的 x、y 次数, 系数位数)：系数位数扫描线与次数扫描线
+RESULTANT_SHAPES = tuple(
+    dict.fromkeys([(2, bits) for bits in N_BITS] + [(deg, 64) for deg in (2, 3, 4)])
+)
+# --quick：N ≤ 256 位、维度 ≤ 8 的形状与 64 位系数的结果式
+QUICK_MAX_BITS = 256
+QUICK_MAX_DIM = 8
+
+
+@dataclass(frozen=True)
+class Case:
+    """One timed measurement; ``prepare`` runs untimed and returns the timed thunk."""
+
+    name: str
+    prepare: Callable[[], Callable[[], object]]
+
+
+def _calibration() -> int:
+    # 固定的大整数乘模 + dict 写入，代表本包热点的算术类型，但不调用本包代码
+    M = (1 << 1279) - 1
+    x = (1 << 521) - 1
+    acc = 1
+    table: dict[int, int] = {}
+    for i in range(4000):
+        acc = (acc * x + i) % M
+        table[i & 1023] = acc & 0xFFFF
+    return acc
+
+
+def best_time(fn: Callable[[], object], repeats: int = REPEATS) -> float:
+    """Best per-call time over ``repeats`` rounds; fast calls are looped to >= MIN_ROUND."""
+    # 与 timeit 相同：计时期间关闭 GC
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _best_time(fn, repeats)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _best_time(fn: Callable[[], object], repeats: int) -> float:
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= MIN_ROUND:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeats - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def _instance(n_bits: int, d: int, m: int, t: int, seed: int) -> tuple[list[int], int, int, int]:
+    # 首一 d 次 f 与随机奇数 N（计时与 N 是否为 RSA 模数无关），植入根 r，|r| < X
+    rng = random.Random(f"{seed}:{n_bits}:{d}:{m}:{t}")
+    N = rng.getrandbits(n_bits) | (1 << (n_bits - 1)) | 1
+    f = [rng.randrange(N) for _ in range(d)] + [1]
+    x_bits = 2
+    while precheck_univariate(f, N, 1 << (x_bits + 1), m, t).margin_bits >= X_MARGIN_BITS:
+        x_bits += 1
+    X = 1 << x_bits
+    r = rng.randrange(X // 2, X)
+    f[0] = (f[0] - sum(c * r**i for i, c in enumerate(f))) % N
+    return f, N, X, r
+
+
+def _reduce(B: list[list[int]], N: int, m: int, backend: str) -> list[list[int]]:
+    # 与求解器一致：第一行满足 Howgrave-Graham 界即停止
+    return reduce_basis(B, backend, stop=stop_when_short(howgrave_graham_bound2(N, m, len(B))))
+
+
+def _construct_case(n_bits: int, d: int, m: int, t: int) -> Callable[[], object]:
+    f, N, X, _r = _instance(n_bits, d, m, t, 1)
+
+    def run() -> object:
+        # 绕过 LRU 缓存，测的是实际构造
+        _build_lattice.cache_clear()
+        return construct_lattice(f, N, X, m, t)
+
+    return run
+
+
+def _lll_case(n_bits: int, d: int, m: int, t: int, backend: str) -> Callable[[], object]:
+    f, N, X, _r = _instance(n_bits, d, m, t, 2)
+    B, _ = construct_lattice(f, N, X, m, t)
+    return lambda: _reduce(B, N, m, backend)
+
+
+def _extract_case(n_bits: int, d: int, m: int, t: int) -> Callable[[], object]:
+    f, N, X, r = _instance(n_bits, d, m, t, 3)
+    B, _ = construct_lattice(f, N, X, m, t)
+    Bref = _reduce(B, N, m, "fp")
+    fp = from_coeffs(f)
+    if r not in extract_roots(Bref, fp, N, X):
+        raise RuntimeError(f"planted root not recovered (n_bits={n_bits}, d={d})")
+    return lambda: extract_roots(Bref, fp, N, X)
+
+
+def _rand_bivar_frac(rng: random.Random, deg: int, bits: int) -> BivarFrac:
+    return {
+        (i, j): Fraction(rng.getrandbits(bits) - (1 << (bits - 1)), rng.randint(1, 8))
+        for i in range(deg + 1)
+        for j in range(deg + 1)
+    }
+
+
+def _resultant_case(deg: int, bits: int, method: str) -> Callable[[], object]:
+    rng = random.Random(f"resultant:{deg}:{bits}")
+    G1 = _rand_bivar_frac(rng, deg, bits)
+    G2 = _rand_bivar_frac(rng, deg, bits)
+    X = 2 * deg * deg
+    return lambda: resultant_in_x(G1, G2, X, X, method)
+
+
+def cases(quick: bool = False) -> list[Case]:
+    """All benchmark cases (the small-size subset when ``quick``)."""
+    out: list[Case] = []
+    for nb, d, m, t in SHAPES:
+        dim = d * m + t
+        if quick and (nb > QUICK_MAX_BITS or dim > QUICK_MAX_DIM):
+            continue
+        tag = f"n{nb}/d{d}/dim{dim}"
+        out.append(Case(f"construct/{tag}", lambda a=(nb, d, m, t): _construct_case(*a)))
+        out.extend(
+            Case(f"lll/{backend}/{tag}", lambda a=(nb, d, m, t, backend): _lll_case(*a))
+            for backend in LLL_BACKENDS
+        )
+        out.append(Case(f"extract/{tag}", lambda a=(nb, d, m, t): _extract_case(*a)))
+    for deg, bits in RESULTANT_SHAPES:
+        if quick and bits > 64:
+            continue
+        out.extend(
+            Case(
+                f"resultant/{method}/deg{deg}/b{bits}",
+                lambda a=(deg, bits, method): _resultant_case(*a),
+            )
+            for method in RESULTANT_METHODS
+        )
+    return out
+
+
+def measure(
+    selected: list[Case],
+    repeats: int = REPEATS,
+    report: Callable[[str, float], None] | None = None,
+) -> dict[str, float]:
+    """Run the cases and return their times in calibration units.
+
+    Each of the ``repeats`` rounds times the calibration workload right before the
+    case and keeps the ratio; the median ratio is reported, so drifts in machine speed
+    during a long run cancel out. ``report`` (optional) is called with each result as
+    soon as it is measured.
+    """
+    results: dict[str, float] = {}
+    for case in selected:
+        fn = case.prepare()
+        ratios = sorted(best_time(fn, 1) / best_time(_calibration, 1) for _ in range(repeats))
+        results[case.name] = ratios[len(ratios) // 2]
+        if report is not None:
+            report(case.name, results[case.name])
+    return results
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, float]:
+    """Read the baseline file.
+
+    Raises:
+      ValueError: if the file was written by an incompatible version of this suite
+    """
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("version") != BASELINE_VERSION:
+        raise ValueError(
+            f"baseline version {payload.get('version')!r} != {BASELINE_VERSION}; "
+            "regenerate it with --update"
+        )
+    return payload["cases"]
+
+
+def save_baseline(results: dict[str, float], path: Path = BASELINE_PATH) -> None:
+    payload = {
+        "version": BASELINE_VERSION,
+        "unit": "median over rounds of case time / calibration workload time",
+        "cases": {name: float(f"{v:.4g}") for name, v in sorted(results.items())},
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], tolerance: float = DEFAULT_TOLERANCE
+) -> list[str]:
+    """Return a message for every case slower than (1 + tolerance) × its baseline.
+
+    Cases missing from the baseline are not checked.
+    """
+    regressions = []
+    for name, value in results.items():
+        ref = baseline.get(name)
+        if ref is not None and value > ref * (1 + tolerance):
+            regressions.append(f"{name}: {value:.3f} vs baseline {ref:.3f} ({value / ref:.2f}x)")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_scaling")
+    parser.add_argument("--quick", action="store_true", help="small sizes only")
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--check", action="store_true", help="compare with the baseline")
+    parser.add_argument("--update", action="store_true", help="rewrite the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args(argv)
+
+    baseline: dict[str, float] = {}
+    if BASELINE_PATH.exists():
+        try:
+            baseline = load_baseline()
+        except ValueError:
+            if not args.update:
+                raise
+    elif args.check:
+        raise FileNotFoundError(f"no baseline at {BASELINE_PATH}; create it with --update")
+
+    def report(name: str, value: float) -> None:
+        ref = baseline.get(name)
+        ratio = f"{value / ref:6.2f}x" if ref else "      -"
+        print(f"{name:40s} {value:12.4f} {ratio}", flush=True)
+
+    selected = [c for c in cases(args.quick) if args.filter in c.name]
+    results = measure(selected, args.repeats, report)
+    if args.update:
+        # 只跑了子集时保留基线中的其他用例
+        save_baseline({**baseline, **results})
+    if args.check:
+        regressions = compare(results, baseline, args.tolerance)
+        for msg in regressions:
+            print(f"REGRESSION {msg}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
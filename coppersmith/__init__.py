@@ -1,25 +1,33 @@
 """Educational Coppersmith toolkit (teaching-only).
 
 Modules:
-- poly: integer polynomial utilities (dict-based)
-- lll: Fraction-based LLL reduction for integer matrices
+- poly: integer polynomial utilities (dict-based, with a dense Karatsuba/Kronecker core)
+- lll: Fraction-based and incremental integer LLL reduction for integer matrices
 - univariate: Howgrave–Graham-style univariate small-root search
 - bivar / bivariate: bivariate poly ops and small-root search with elimination
 - elimination: Bareiss determinant, Sylvester matrix, interpolation resultant
+- batch: process-pool fan-out of independent univariate/bivariate jobs
+- bench: seeded parameter-grid scans (success rate / latency per cell); run as
+  ``python -m coppersmith.bench``, so it is not imported here
+- instances: seeded Miller–Rabin primes, cached RSA moduli and scenario instances
+- stats: opt-in per-stage timing and counters for the solvers
 
 Notes:
 - This package is designed for clarity and reproducibility, not speed or hardening.
 - All APIs intentionally use standard library types and explicit integer arithmetic.
 """
 
-from . import bivar, bivariate, elimination, lll, poly, univariate
+from . import batch, bivar, bivariate, elimination, instances, lll, poly, stats, univariate
 
 __all__ = [
+    "batch",
     "bivar",
     "bivariate",
     "elimination",
+    "instances",
     "lll",
     "poly",
+    "stats",
     "univariate",
 ]
 
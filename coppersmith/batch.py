@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import signal
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from .bivar import Bivar
+from .bivariate import (
+    BivarLatticeTemplate,
+    roots_from_reduced_basis,
+    try_find_small_roots_bivar,
+)
+from .lll import howgrave_graham_bound2, reduce_basis, stop_when_short
+from .univariate import find_small_roots_univariate
+
+# 多进程批量求解：把互相独立的单变量 / 二元实例分发到 ProcessPoolExecutor。
+# - 任务只携带多项式系数与参数（整数元组），格基在工作进程内构造（各进程有自己的 LRU 缓存），
+#   序列化开销与格维度无关
+# - 按块提交（chunksize 个任务一个 future），降低进程间往返次数
+# - 单任务超时在工作进程内用 SIGALRM 实现（仅 Unix；其他平台忽略 timeout）
+# - 默认按完成顺序产出结果；ordered=True 时按输入顺序产出
+
+
+@dataclass(frozen=True)
+class UnivariateJob:
+    """Arguments of one ``find_small_roots_univariate`` call."""
+
+    f_coeffs: tuple[int, ...]
+    N: int
+    X: int
+    m: int | str = 3
+    t: int = 3
+    backend: str = "int"
+    extraction: str = "gcd"
+    beta: float = 1.0
+
+
+@dataclass(frozen=True)
+class BivariateJob:
+    """Arguments of one ``try_find_small_roots_bivar`` call; F as sorted (monomial, coeff) items."""
+
+    F: tuple[tuple[tuple[int, int], int], ...]
+    N: int
+    X: int
+    Y: int
+    m: int = 2
+    tx: int = 2
+    ty: int = 2
+    backend: str = "int"
+    resultant: str = "modular"
+
+    @classmethod
+    def from_bivar(
+        cls,
+        F: Bivar,
+        N: int,
+        X: int,
+        Y: int,
+        m: int = 2,
+        tx: int = 2,
+        ty: int = 2,
+        backend: str = "int",
+        resultant: str = "modular",
+    ) -> BivariateJob:
+        return cls(tuple(sorted(F.items())), N, X, Y, m, tx, ty, backend, resultant)
+
+
+Job = UnivariateJob | BivariateJob
+
+
+@dataclass(frozen=True)
+class JobResult:
+    """Outcome of one job.
+
+    Attributes:
+      index: position of the job in the input sequence
+      roots: roots found (``list[int]`` or ``list[tuple[int, int]]``); None on error/timeout
+      error: ``repr`` of the exception raised by the job, if any
+      timed_out: the job exceeded its time limit
+      elapsed: wall time spent on the job inside the worker (seconds)
+    """
+
+    index: int
+    roots: list | None
+    error: str | None
+    timed_out: bool
+    elapsed: float
+
+
+class JobTimeout(Exception):
+    """Raised inside a worker when a job exceeds its time limit."""
+
+
+def run_job(job: Job) -> list:
+    """Run one job in the current process.
+
+    Raises:
+      TypeError: if job is not a UnivariateJob or BivariateJob
+    """
+    if isinstance(job, UnivariateJob):
+        return find_small_roots_univariate(
+            list(job.f_coeffs),
+            job.N,
+            job.X,
+            job.m,
+            job.t,
+            job.backend,
+            job.extraction,
+            job.beta,
+        )
+    if isinstance(job, BivariateJob):
+        return try_find_small_roots_bivar(
+            dict(job.F), job.N, job.X, job.Y, job.m, job.tx, job.ty, job.backend, job.resultant
+        )
+    raise TypeError(f"unsupported job type: {type(job).__name__}")
+
+
+def _on_alarm(_signum: int, _frame: object) -> None:
+    raise JobTimeout
+
+
+def _run_timed(index: int, job: Job, timeout: float | None) -> JobResult:
+    use_alarm = timeout is not None and hasattr(signal, "setitimer")
+    if use_alarm:
+        old = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    t0 = time.perf_counter()
+    try:
+        roots = run_job(job)
+        return JobResult(index, roots, None, False, time.perf_counter() - t0)
+    except JobTimeout:
+        return JobResult(index, None, None, True, time.perf_counter() - t0)
+    except Exception as exc:  # 单个任务失败不影响整批
+        return JobResult(index, None, repr(exc), False, time.perf_counter() - t0)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, old)
+
+
+def _run_chunk(chunk: list[tuple[int, Job]], timeout: float | None) -> list[JobResult]:
+    return [_run_timed(index, job, timeout) for index, job in chunk]
+
+
+def iter_solve(
+    jobs: Iterable[Job],
+    max_workers: int | None = None,
+    chunksize: int = 1,
+    timeout: float | None = None,
+    ordered: bool = False,
+) -> Iterator[JobResult]:
+    """Solve independent jobs in a process pool, yielding results as they complete.
+
+    Args:
+      jobs: UnivariateJob / BivariateJob instances
+      max_workers: pool size (default ``os.cpu_count()``); 0 runs every job inline
+      chunksize: jobs per submitted task
+      timeout: per-job wall-time limit in seconds (enforced with SIGALRM on Unix)
+      ordered: yield in input order instead of completion order
+    Raises:
+      ValueError: if chunksize < 1 or max_workers < 0
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+    if max_workers is not None and max_workers < 0:
+        raise ValueError("max_workers must be >= 0")
+    indexed = list(enumerate(jobs))
+    chunks = [indexed[i : i + chunksize] for i in range(0, len(indexed), chunksize)]
+    if max_workers == 0:
+        for chunk in chunks:
+            yield from _run_chunk(chunk, timeout)
+        return
+
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(chunks), 1))) as pool:
+        pending: set[Future[list[JobResult]]] = {
+            pool.submit(_run_chunk, chunk, timeout) for chunk in chunks
+        }
+        buffered: dict[int, JobResult] = {}
+        next_index = 0
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    for res in fut.result():
+                        if not ordered:
+                            yield res
+                        else:
+                            buffered[res.index] = res
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+        finally:
+            # 调用方提前停止迭代时，不再启动尚未开始的块
+            for fut in pending:
+                fut.cancel()
+
+
+def solve_all(
+    jobs: Iterable[Job],
+    max_workers: int | None = None,
+    chunksize: int = 1,
+    timeout: float | None = None,
+) -> list[JobResult]:
+    """Solve all jobs and return their results in input order (see ``iter_solve``)."""
+    return list(iter_solve(jobs, max_workers, chunksize, timeout, ordered=True))
+
+
+# ----------------- 已知高位 + 穷举猜测（Partial Key Exposure） -----------------
+# p = p_high·2^u + low，0 <= low < 2^u。格只能处理 L = lattice_bits 个未知位时，
+# 再猜 g = u - L 个位：猜测 s 覆盖 [p_high·2^u + s·2^L, p_high·2^u + (s+1)·2^L]，
+# 取区间中点 p0 = p_high·2^u + s·2^L + 2^(L-1)，在 F(x,y) = (p0+x)(q0+y) - N 上跑一次二元格，
+# |x| < X = 2^(L-1) + 1。相邻窗口只在端点（偶数）相接，奇素数 p 恰好落在一个猜测里。
+# 代价：这一模型的 G1、G2 常有公因子（R(x) ≡ 0），根提取回退为逐个 x 扫描，
+# 因此每个猜测的耗时与 2^L 成正比（见 SolveStats 的 x_scan_fallback）。
+# 所有猜测的 F 支撑相同，格的列布局与缩放（BivarLatticeTemplate）在父进程算一次，
+# 通过进程池 initializer 下发；任一工作进程命中后置位共享 Event，其余进程在下一个猜测前退出。
+
+
+@dataclass(frozen=True)
+class HighBitsHit:
+    """A successful guess: p = p0 + x, q = q0 + y, p·q = N."""
+
+    p: int
+    q: int
+    guess: int
+    x: int
+    y: int
+
+
+_worker_state: dict[str, Any] = {}
+
+
+def _init_guess_worker(template: BivarLatticeTemplate, stop: Any) -> None:
+    _worker_state["template"] = template
+    _worker_state["stop"] = stop
+
+
+def _high_bits_poly(N: int, p0: int) -> tuple[Bivar, int]:
+    q0 = N // p0
+    return {(1, 1): 1, (1, 0): q0, (0, 1): p0, (0, 0): p0 * q0 - N}, q0
+
+
+def _try_guess(
+    template: BivarLatticeTemplate, p0: int, backend: str, resultant: str
+) -> tuple[int, int, int, int] | None:
+    N = template.N
+    F, q0 = _high_bits_poly(N, p0)
+    stop = stop_when_short(howgrave_graham_bound2(N, template.m, len(template.cols)), 2)
+    Bref = reduce_basis(template.build(F), backend, stop=stop)
+    roots = roots_from_reduced_basis(Bref, template.cols, F, N, template.X, template.Y, resultant)
+    for x, y in roots:
+        p, q = p0 + x, q0 + y
+        if 1 < p < N and p * q == N:
+            return p, q, x, y
+    return None
+
+
+def _guess_center(base: int, shift: int, s: int) -> int:
+    return base + (s << shift) + (1 << shift >> 1)
+
+
+def _run_guesses(
+    base: int, shift: int, guesses: list[int], backend: str, resultant: str
+) -> HighBitsHit | None:
+    template: BivarLatticeTemplate = _worker_state["template"]
+    stop = _worker_state["stop"]
+    for s in guesses:
+        if stop.is_set():
+            return None
+        hit = _try_guess(template, _guess_center(base, shift, s), backend, resultant)
+        if hit is not None:
+            stop.set()
+            p, q, x, y = hit
+            return HighBitsHit(p, q, s, x, y)
+    return None
+
+
+def factor_high_bits_guessing(
+    N: int,
+    p_high: int,
+    unknown_bits: int,
+    lattice_bits: int,
+    m: int = 2,
+    tx: int = 2,
+    ty: int = 2,
+    backend: str = "int",
+    resultant: str = "modular",
+    max_workers: int | None = None,
+    chunksize: int = 8,
+) -> HighBitsHit | None:
+    """Factor N = p·q from the high bits of p, guessing the bits the lattice cannot reach.
+
+    p is assumed to be p_high·2^unknown_bits + low with 0 <= low < 2^unknown_bits. The
+    lowest ``lattice_bits`` bits are left to the lattice; the 2^(unknown_bits -
+    lattice_bits) values of the remaining bits are enumerated across worker processes.
+    Each guess s centres its lattice on the middle of its window, so the windows do
+    not overlap and an odd p is found by exactly one guess: the reported ``guess`` is
+    always (p mod 2^unknown_bits) >> lattice_bits, whichever worker finishes first.
+
+    Per-guess cost grows linearly with 2^lattice_bits: for this model the two
+    shortest rows usually share a factor, so root extraction scans every |x| < X.
+
+    Args:
+      N: modulus p·q
+      p_high: known high part of p
+      unknown_bits: number of unknown low bits of p
+      lattice_bits: unknown bits handled by each lattice (X = 2^(lattice_bits-1) + 1
+        around the window centre)
+      m, tx, ty, backend, resultant: as in ``try_find_small_roots_bivar``
+      max_workers: pool size (default ``os.cpu_count()``); 0 runs the guesses inline
+      chunksize: guesses per submitted task (also the granularity of early stopping)
+    Returns:
+      The first hit found, or None if no guess factors N
+    Raises:
+      ValueError: if the bit counts are inconsistent, p_high <= 0, or chunksize < 1
+    """
+    if p_high <= 0:
+        raise ValueError("p_high must be positive")
+    if not 0 <= lattice_bits <= unknown_bits:
+        raise ValueError("need 0 <= lattice_bits <= unknown_bits")
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+    base = p_high << unknown_bits
+    X = (1 << lattice_bits >> 1) + 1
+    # y = q - q0 ≈ -x·q0/p0：Y 按 q0/p0 的比例放大
+    p_min = max(base, 1)
+    Y = X * (N // (p_min * p_min) + 2)
+    F_probe, _ = _high_bits_poly(N, p_min)
+    template = BivarLatticeTemplate.for_support(F_probe, N, X, Y, m, tx, ty)
+
+    guesses = list(range(1 << (unknown_bits - lattice_bits)))
+    chunks = [guesses[i : i + chunksize] for i in range(0, len(guesses), chunksize)]
+    if max_workers == 0:
+        _init_guess_worker(template, multiprocessing.Event())
+        for chunk in chunks:
+            hit = _run_guesses(base, lattice_bits, chunk, backend, resultant)
+            if hit is not None:
+                return hit
+        return None
+
+    ctx = multiprocessing.get_context()
+    stop = ctx.Event()
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        mp_context=ctx,
+        initializer=_init_guess_worker,
+        initargs=(template, stop),
+    ) as pool:
+        pending = {
+            pool.submit(_run_guesses, base, lattice_bits, chunk, backend, resultant)
+            for chunk in chunks
+        }
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    hit = fut.result()
+                    if hit is not None:
+                        return hit
+        finally:
+            stop.set()
+            for fut in pending:
+                fut.cancel()
+    return None
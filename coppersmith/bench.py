@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import random
+import sys
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass, fields
+from typing import IO
+
+from .batch import BivariateJob, Job, UnivariateJob, iter_solve
+from .bivariate import construct_bivar_lattice
+from .instances import partial_p_bits, rsa_modulus, small_e_message
+
+# 参数扫描器：对每个场景模型在参数网格上生成带种子的随机实例，经进程池（batch.iter_solve）
+# 求解，按网格单元汇总成功率、p50/p95 耗时与格维度，输出 JSON 或 CSV，用于按数据选参。
+# 场景：
+#   - rsa-e3：instances.small_e_message，f(x) = x^3 - c (mod N)，消息 r ∈ [X/2, X)；
+#     网格 (n_bits, x_bits, m, t)
+#   - high-bits：instances.partial_p_bits，p 的低 x_bits 位未知，f(x) = p0 + x，未知因子模式
+#     beta = (n_bits/2 - 1)/n_bits；网格 (n_bits, x_bits, m, t)
+#   - bivar：构造 F(x,y) = x^2 + y + c，c ≡ -(r^2 + s)；网格 (n_bits, x_bits, y_bits, m, tx, ty)
+# 实例只依赖 (seed, 网格单元, 试验序号)，改变网格或进程数不影响已有单元的实例。
+# 用法：python -m coppersmith.bench --scenario rsa-e3 --trials 20 --format csv -o scan.csv
+
+SCENARIOS = ("rsa-e3", "high-bits", "bivar")
+
+# 各场景的默认网格（命令行可逐项覆盖）
+DEFAULT_GRIDS: dict[str, dict[str, tuple[int, ...]]] = {
+    "rsa-e3": {"n_bits": (256,), "x_bits": (64, 80), "m": (2, 3), "t": (1, 2)},
+    "high-bits": {"n_bits": (256,), "x_bits": (48, 56), "m": (2, 3), "t": (2, 4)},
+    "bivar": {
+        "n_bits": (64,),
+        "x_bits": (4, 6),
+        "y_bits": (4, 6),
+        "m": (2,),
+        "t": (2,),
+        "ty": (2,),
+    },
+}
+
+
+@dataclass(frozen=True)
+class GridCell:
+    """One point of the parameter grid; fields a scenario does not use are 0.
+
+    For "bivar", t is tx.
+    """
+
+    scenario: str
+    n_bits: int
+    x_bits: int
+    m: int
+    t: int
+    y_bits: int = 0
+    ty: int = 0
+    backend: str = "int"
+
+
+@dataclass(frozen=True)
+class CellResult:
+    """Aggregated outcome of the trials of one grid cell (latencies in milliseconds)."""
+
+    scenario: str
+    n_bits: int
+    x_bits: int
+    m: int
+    t: int
+    y_bits: int
+    ty: int
+    backend: str
+    dim: int
+    trials: int
+    successes: int
+    success_rate: float
+    p50_ms: float
+    p95_ms: float
+    timeouts: int
+    errors: int
+
+
+def grid(
+    scenario: str, backends: Sequence[str] = ("int",), **axes: Sequence[int]
+) -> list[GridCell]:
+    """Cartesian product of the scenario's default grid, with the given axes overridden.
+
+    Raises:
+      ValueError: if the scenario or an axis name is unknown
+    """
+    try:
+        spec = dict(DEFAULT_GRIDS[scenario])
+    except KeyError:
+        raise ValueError(f"unknown scenario: {scenario!r}") from None
+    for name, values in axes.items():
+        if name not in spec:
+            raise ValueError(f"scenario {scenario!r} has no axis {name!r}")
+        spec[name] = tuple(values)
+    names = list(spec)
+    return [
+        GridCell(
+            scenario=scenario, backend=backend, **{names[i]: combo[i] for i in range(len(names))}
+        )
+        for combo in itertools.product(*(spec[name] for name in names))
+        for backend in backends
+    ]
+
+
+def make_instance(cell: GridCell, seed: int, trial: int) -> tuple[Job, object]:
+    """Build the seeded job of one trial and the root it must find.
+
+    Instances come from the ``coppersmith.instances`` scenario models, seeded by
+    (seed, cell, trial); moduli of 256 bits and more go through its disk cache.
+
+    Raises:
+      ValueError: if the scenario is unknown or the cell's sizes are out of its range
+    """
+    key = f"{seed}:{cell}:{trial}"
+    if cell.scenario == "rsa-e3":
+        inst = small_e_message(cell.n_bits, e=3, msg_bits=cell.x_bits, seed=key)
+        job = UnivariateJob(tuple(inst.poly()), inst.N, inst.X, cell.m, cell.t, cell.backend)
+        return job, inst.m
+    if cell.scenario == "high-bits":
+        pp = partial_p_bits(cell.n_bits, cell.x_bits, seed=key)
+        job = UnivariateJob(
+            tuple(pp.poly()), pp.N, pp.X, cell.m, cell.t, cell.backend, beta=pp.beta
+        )
+        return job, pp.p - pp.p0
+    if cell.scenario == "bivar":
+        N = rsa_modulus(cell.n_bits, seed=key).N
+        rng = random.Random(key)
+        X, Y = 1 << cell.x_bits, 1 << cell.y_bits
+        r = rng.randrange(-X + 1, X)
+        s = rng.randrange(-Y + 1, Y)
+        F = {(2, 0): 1, (0, 1): 1, (0, 0): (-(r * r + s)) % N}
+        job = BivariateJob.from_bivar(F, N, X, Y, cell.m, cell.t, cell.ty, cell.backend)
+        return job, (r, s)
+    raise ValueError(f"unknown scenario: {cell.scenario!r}")
+
+
+def lattice_dimension(job: Job) -> int:
+    """Number of rows of the lattice the job reduces (the first one for m="auto")."""
+    if isinstance(job, UnivariateJob):
+        if not isinstance(job.m, int):
+            return 0
+        return (len(job.f_coeffs) - 1) * job.m + job.t
+    B, _ = construct_bivar_lattice(dict(job.F), job.N, job.X, job.Y, job.m, job.tx, job.ty)
+    return len(B)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in [0, 100]); 0.0 for an empty sequence."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[min(int(rank), len(ordered)) - 1]
+
+
+def run_grid(
+    cells: Iterable[GridCell],
+    trials: int = 10,
+    seed: int = 0,
+    max_workers: int | None = None,
+    timeout: float | None = None,
+    chunksize: int = 1,
+) -> list[CellResult]:
+    """Solve ``trials`` seeded instances per cell in one process pool and aggregate them.
+
+    A trial succeeds when the planted root is among the roots returned; timeouts and
+    errors count as failures. Latency is the wall time measured inside the worker.
+
+    Raises:
+      ValueError: if trials < 1
+    """
+    if trials < 1:
+        raise ValueError("trials must be >= 1")
+    cells = list(cells)
+    jobs: list[Job] = []
+    expected: list[object] = []
+    dims: list[int] = []
+    for cell in cells:
+        for trial in range(trials):
+            job, root = make_instance(cell, seed, trial)
+            jobs.append(job)
+            expected.append(root)
+        dims.append(lattice_dimension(jobs[-1]))
+
+    outcomes = [[] for _ in cells]
+    for res in iter_solve(jobs, max_workers, chunksize, timeout):
+        outcomes[res.index // trials].append(res)
+
+    results = []
+    for ci, cell in enumerate(cells):
+        runs = outcomes[ci]
+        ok = sum(res.roots is not None and expected[res.index] in res.roots for res in runs)
+        ms = [res.elapsed * 1000 for res in runs]
+        results.append(
+            CellResult(
+                **asdict(cell),
+                dim=dims[ci],
+                trials=trials,
+                successes=ok,
+                success_rate=ok / trials,
+                p50_ms=round(percentile(ms, 50), 3),
+                p95_ms=round(percentile(ms, 95), 3),
+                timeouts=sum(res.timed_out for res in runs),
+                errors=sum(res.error is not None for res in runs),
+            )
+        )
+    return results
+
+
+def write_json(results: Sequence[CellResult], fh: IO[str]) -> None:
+    json.dump([asdict(r) for r in results], fh, indent=2)
+    fh.write("\n")
+
+
+def write_csv(results: Sequence[CellResult], fh: IO[str]) -> None:
+    writer = csv.DictWriter(fh, fieldnames=[f.name for f in fields(CellResult)])
+    writer.writeheader()
+    for r in results:
+        writer.writerow(asdict(r))
+
+
+def _int_list(text: str) -> tuple[int, ...]:
+    return tuple(int(v) for v in text.split(",") if v)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m coppersmith.bench",
+        description="Grid-scan solver parameters on seeded instances.",
+    )
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS)
+    parser.add_argument("--backend", action="append", help="LLL backend(s), default int")
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="0 = run in this process")
+    parser.add_argument("--timeout", type=float, default=None, help="per-instance seconds")
+    parser.add_argument("--chunksize", type=int, default=1)
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("-o", "--output", help="output file (default stdout)")
+    for axis in ("n_bits", "x_bits", "y_bits", "m", "t", "ty"):
+        parser.add_argument(f"--{axis.replace('_', '-')}", dest=axis, type=_int_list)
+    args = parser.parse_args(argv)
+
+    cells: list[GridCell] = []
+    for scenario in args.scenario or SCENARIOS:
+        axes = {
+            axis: getattr(args, axis)
+            for axis in DEFAULT_GRIDS[scenario]
+            if getattr(args, axis) is not None
+        }
+        cells.extend(grid(scenario, args.backend or ("int",), **axes))
+    results = run_grid(cells, args.trials, args.seed, args.workers, args.timeout, args.chunksize)
+    write = write_csv if args.format == "csv" else write_json
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as fh:
+            write(results, fh)
+    else:
+        write(results, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
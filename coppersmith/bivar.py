@@ -3,6 +3,12 @@ from __future__ import annotations
 # 二元多项式：map[(ix, iy)] -> int
 Bivar = dict[tuple[int, int], int]
 
+# Kronecker 代换的适用范围（benchmarks/bench_bivar_mul.py 实测）：CPython 大整数乘法只有
+# Karatsuba，打包只省解释器开销，不降低渐近复杂度。稠密、系数 ≤128 位且 ≥32 项时快 1.4–13 倍；
+# 高位分解模型的 F^m 系数大小悬殊、槽位一半为空，256/1024 位系数下任何 m 都比 dict 循环慢
+KRONECKER_MIN_TERMS = 32
+KRONECKER_MAX_BITS = 128
+
 
 def normalize(p: Bivar) -> Bivar:
     return {k: v for k, v in p.items() if v != 0}
@@ -23,17 +29,72 @@ def scale(a: Bivar, c: int) -> Bivar:
     return {(i, j): v * c for (i, j), v in a.items()}
 
 
-def mul(a: Bivar, b: Bivar) -> Bivar:
+def mul_dict(a: Bivar, b: Bivar) -> Bivar:
+    """Return a * b by the O(|a|·|b|) double loop over terms."""
     out: Bivar = {}
     for (i1, j1), v1 in a.items():
         for (i2, j2), v2 in b.items():
             key = (i1 + i2, j1 + j2)
             out[key] = out.get(key, 0) + v1 * v2
-            if out[key] == 0:
-                del out[key]
+    return normalize(out)
+
+
+def _kron_pack_signed(a: Bivar, W: int, n: int, nbytes: int) -> int:
+    # 补码槽：负系数 v 存为 v + 2^s，整体再减去这些槽向上一槽的进位 Σ 2^{s(k+1)}
+    slots = [0] * n
+    for (i, j), v in a.items():
+        slots[i * W + j] = v
+    packed = int.from_bytes(
+        b"".join(v.to_bytes(nbytes, "little", signed=True) for v in slots), "little"
+    )
+    zero = bytes(nbytes)
+    one = b"\x01" + bytes(nbytes - 1)
+    borrow = int.from_bytes(b"".join(one if v < 0 else zero for v in slots), "little")
+    return packed - (borrow << (8 * nbytes))
+
+
+def mul_kronecker(a: Bivar, b: Bivar) -> Bivar:
+    """Return a * b via Kronecker substitution y -> x^W (W > deg_y of the product).
+
+    Every (ix, iy) slot of each factor is packed, signed, into one big integer, so
+    the product is a single CPython big-integer multiplication (no bit cap).
+    """
+    if not a or not b:
+        return {}
+    W = degree_y(a) + degree_y(b) + 1
+    n = (degree_x(a) + degree_x(b) + 1) * W
+    # |乘积系数| ≤ min(|a|,|b|)·max|a|·max|b|；槽宽再留一位符号
+    bound = min(len(a), len(b)) * max(map(abs, a.values())) * max(map(abs, b.values()))
+    nbytes = (bound.bit_length() + 1) // 8 + 1
+    s = 8 * nbytes
+    C = _kron_pack_signed(a, W, n, nbytes) * _kron_pack_signed(b, W, n, nbytes)
+    raw = (C & ((1 << (s * n)) - 1)).to_bytes(nbytes * n, "little")
+    # 自低向高读补码槽，负槽向上一槽借 1
+    half, full = 1 << (s - 1), 1 << s
+    out: Bivar = {}
+    borrow = 0
+    for k in range(n):
+        v = int.from_bytes(raw[k * nbytes : (k + 1) * nbytes], "little") + borrow
+        if v >= half:
+            v -= full
+            borrow = 1
+        else:
+            borrow = 0
+        if v:
+            out[divmod(k, W)] = v
     return out
 
 
+def mul(a: Bivar, b: Bivar) -> Bivar:
+    """Return a * b; many-term products of small coefficients use Kronecker substitution."""
+    if min(len(a), len(b)) < KRONECKER_MIN_TERMS:
+        return mul_dict(a, b)
+    bits = max(abs(v).bit_length() for v in (*a.values(), *b.values()))
+    if bits > KRONECKER_MAX_BITS:
+        return mul_dict(a, b)
+    return mul_kronecker(a, b)
+
+
 def pow_bivar(a: Bivar, e: int) -> Bivar:
     if e < 0:
         raise ValueError("exponent must be >= 0")
@@ -43,8 +104,9 @@ def pow_bivar(a: Bivar, e: int) -> Bivar:
     while ee > 0:
         if ee & 1:
             out = mul(out, base)
-        base = mul(base, base)
         ee >>= 1
+        if ee:
+            base = mul(base, base)
     return out
 
 
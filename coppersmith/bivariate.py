@@ -1,16 +1,37 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from fractions import Fraction
+from functools import lru_cache
 
-from .bivar import Bivar, degree_x, degree_y, pow_bivar, shift_x, shift_y
-from .elimination import resultant_in_x_by_interpolation
-from .lll import lll_reduction
+from .bivar import (
+    Bivar,
+    degree_x,
+    degree_y,
+    eval_at as bivar_eval_at,
+    mul as bivar_mul,
+    shift_x,
+    shift_y,
+)
+from .elimination import (
+    BivarFrac,
+    bivar_frac_eval_x_get_univar_y,
+    clear_denominators,
+    resultant_in_x,
+)
+from .lll import howgrave_graham_bound2, reduce_basis, stop_when_short
+from .poly import Poly, degree, from_coeffs, gcd_poly, integer_roots, to_coeffs
+from .stats import SolveStats, stage
+from .univariate import find_small_roots_univariate, make_monic_mod
 
 # 二元 Coppersmith（教学版，简化 Howgrave-Graham 思路）
 # 目标：给定 F(x,y) ∈ Z[x,y]，模 N，若存在小根 |x0|<X, |y0|<Y 使 F(x0,y0) ≡ 0 (mod N)，
 # 尝试恢复 (x0,y0)
 # 仅面向教学和小规模参数；构造法与参数并非最优。
 
+# construct_bivar_lattice 的 LRU 缓存容量
+LATTICE_CACHE_SIZE = 32
+
 
 def construct_bivar_lattice(
     F: Bivar, N: int, X: int, Y: int, m: int, tx: int, ty: int
@@ -18,43 +39,109 @@ def construct_bivar_lattice(
     # 基多项式：
     # 对 i=0..m-1：N^{m-i} * F(x,y)^i * x^ax * y^ay，0<=ax<=dx-1, 0<=ay<=dy-1
     # 以及 F(x,y)^m * x^ax * y^ay，0<=ax<tx, 0<=ay<ty
+    # 结果按 (F, N, X, Y, m, tx, ty) 做 LRU 缓存；每次返回新的列表副本
+    rows, cols = _build_bivar_lattice(tuple(sorted(F.items())), N, X, Y, m, tx, ty)
+    return [list(row) for row in rows], list(cols)
+
+
+@lru_cache(maxsize=LATTICE_CACHE_SIZE)
+def _build_bivar_lattice(
+    F_key: tuple[tuple[tuple[int, int], int], ...], N: int, X: int, Y: int, m: int, tx: int, ty: int
+) -> tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, int], ...]]:
+    polys = _shift_polys(dict(F_key), N, m, tx, ty)
+    all_monos = set()
+    for P in polys:
+        all_monos.update(P.keys())
+    # 需统一列顺序：按 (ix,iy) 字典序
+    cols = tuple(sorted(all_monos))
+    return _fill_rows(polys, cols, _column_scales(cols, X, Y)), cols
+
+
+def _shift_polys(F: Bivar, N: int, m: int, tx: int, ty: int) -> list[Bivar]:
     dx = degree_x(F) + 1
     dy = degree_y(F) + 1
 
+    # 幂次阶梯：F^{i+1} = F^i · F，N 的幂一次性建表
+    N_pows = [1] * (m + 1)
+    for i in range(1, m + 1):
+        N_pows[i] = N_pows[i - 1] * N
+
     polys: list[Bivar] = []
+    Fi: Bivar = {(0, 0): 1}
     for i in range(m):
-        Fi = pow_bivar(F, i)
         # 标量放大
-        FiN = {(ix, iy): coeff * pow(N, m - i) for (ix, iy), coeff in Fi.items()}
+        FiN = {(ix, iy): coeff * N_pows[m - i] for (ix, iy), coeff in Fi.items()}
         polys.extend(
             shift_y(shift_x(FiN, ax), ay)
             for ax in range(max(dx - 1, 1))
             for ay in range(max(dy - 1, 1))
         )
-    Fm = pow_bivar(F, m)
-    polys.extend(shift_y(shift_x(Fm, ax), ay) for ax in range(tx) for ay in range(ty))
+        Fi = bivar_mul(Fi, F)
+    # 循环结束时 Fi = F^m
+    polys.extend(shift_y(shift_x(Fi, ax), ay) for ax in range(tx) for ay in range(ty))
+    return polys
+
+
+def _column_scales(cols: tuple[tuple[int, int], ...], X: int, Y: int) -> tuple[int, ...]:
+    # 列缩放：列 (ix,iy) 乘以 X^ix * Y^iy（幂次建表）
+    max_ix = max((ix for ix, _ in cols), default=0)
+    max_iy = max((iy for _, iy in cols), default=0)
+    X_pows = [1] * (max_ix + 1)
+    for k in range(1, max_ix + 1):
+        X_pows[k] = X_pows[k - 1] * X
+    Y_pows = [1] * (max_iy + 1)
+    for k in range(1, max_iy + 1):
+        Y_pows[k] = Y_pows[k - 1] * Y
+    return tuple(X_pows[ix] * Y_pows[iy] for ix, iy in cols)
 
-    # 列缩放：列 (ix,iy) 乘以 X^ix * Y^iy
-    for P in polys:
-        for (ix, iy), v in list(P.items()):
-            P[(ix, iy)] = v * pow(X, ix) * pow(Y, iy)
 
+def _fill_rows(
+    polys: list[Bivar], cols: tuple[tuple[int, int], ...], scales: tuple[int, ...]
+) -> tuple[tuple[int, ...], ...]:
     # 展平为整数矩阵
-    # 需统一列顺序：按 (ix,iy) 字典序
-    all_monos = set()
-    for P in polys:
-        all_monos.update(P.keys())
-    cols = sorted(all_monos)
     col_index: dict[tuple[int, int], int] = {mon: i for i, mon in enumerate(cols)}
-
-    B: list[list[int]] = []
+    B: list[tuple[int, ...]] = []
     for P in polys:
         row = [0] * len(cols)
         for mon, v in P.items():
-            row[col_index[mon]] = v
-        B.append(row)
+            idx = col_index[mon]
+            row[idx] = v * scales[idx]
+        B.append(tuple(row))
+    return tuple(B)
+
+
+@dataclass(frozen=True)
+class BivarLatticeTemplate:
+    """Column layout and scaling shared by every F with the same support and (N, X, Y, m, tx, ty).
+
+    The monomials of the shift polynomials depend only on the support of F, so a family
+    of polynomials that differ only in coefficient values (e.g. the high-bits model
+    (p0+x)(q0+y)-N for several guesses p0) can reuse one template.
+    """
 
-    return B, cols
+    N: int
+    X: int
+    Y: int
+    m: int
+    tx: int
+    ty: int
+    cols: tuple[tuple[int, int], ...]
+    scales: tuple[int, ...]
+
+    @classmethod
+    def for_support(
+        cls, F: Bivar, N: int, X: int, Y: int, m: int, tx: int, ty: int
+    ) -> BivarLatticeTemplate:
+        # 用全 1 系数的同支撑多项式确定列集合：正系数相乘不会相消，得到的是最大单项式集合，
+        # 任何同支撑 F 的移位多项式都落在其中（个别单项式相消时对应列为 0）
+        probe = {mon: 1 for mon, c in F.items() if c}
+        _rows, cols = _build_bivar_lattice(tuple(sorted(probe.items())), N, X, Y, m, tx, ty)
+        return cls(N, X, Y, m, tx, ty, cols, _column_scales(cols, X, Y))
+
+    def build(self, F: Bivar) -> list[list[int]]:
+        """Return the lattice basis for F (which must have the template's support)."""
+        polys = _shift_polys(F, self.N, self.m, self.tx, self.ty)
+        return [list(row) for row in _fill_rows(polys, self.cols, self.scales)]
 
 
 def eval_unscaled_row_at(
@@ -71,11 +158,47 @@ def eval_unscaled_row_at(
 
 
 def try_find_small_roots_bivar(
-    F: Bivar, N: int, X: int, Y: int, m: int = 2, tx: int = 2, ty: int = 2
+    F: Bivar,
+    N: int,
+    X: int,
+    Y: int,
+    m: int = 2,
+    tx: int = 2,
+    ty: int = 2,
+    backend: str = "int",
+    resultant: str = "modular",
+    early_stop: bool = True,
+    stats: SolveStats | None = None,
 ) -> list[tuple[int, int]]:
-    B, cols = construct_bivar_lattice(F, N, X, Y, m, tx, ty)
-    Bref = lll_reduction(B)
+    # stats（可选）：累加 construct / reduce / resultant / extract 各阶段耗时、LLL 计数、
+    # 结果式采样数与位长，见 coppersmith.stats
+    with stage(stats, "construct"):
+        B, cols = construct_bivar_lattice(F, N, X, Y, m, tx, ty)
+    # 提前终止：前两行都满足 Howgrave-Graham 界 |h| < N^m / sqrt(ω)（ω 为单项式数）即可消元
+    stop = stop_when_short(howgrave_graham_bound2(N, m, len(cols)), 2) if early_stop else None
+    if stats is not None:
+        stats.count("attempts")
+        stats.count("lattice_rows", len(B))
+        stats.max_bits("N", N)
+        stats.max_bits_matrix("lattice_in", B)
+    with stage(stats, "reduce"):
+        Bref = reduce_basis(B, backend, stop=stop, stats=stats)
+    if stats is not None:
+        stats.max_bits_matrix("lattice_out", Bref)
+    return roots_from_reduced_basis(Bref, cols, F, N, X, Y, resultant, stats)
 
+
+def roots_from_reduced_basis(
+    Bref: list[list[int]],
+    cols: list[tuple[int, int]] | tuple[tuple[int, int], ...],
+    F: Bivar,
+    N: int,
+    X: int,
+    Y: int,
+    resultant: str = "modular",
+    stats: SolveStats | None = None,
+) -> list[tuple[int, int]]:
+    """Recover small roots of F mod N from a reduced bivariate lattice basis."""
     # 使用最短的两条向量构造两个多项式 G1,G2（反缩放），再对 y 做结果式消元得到单变量 R(x)
     if len(Bref) < 2:
         return []
@@ -96,24 +219,66 @@ def try_find_small_roots_bivar(
     G2 = row_to_bivarfrac(g_rows[1])
 
     # 计算关于 y 的结果式 R(x)
-    R = resultant_in_x_by_interpolation(G1, G2, X, Y)
-
-    # 在 |x|<X 范围寻找整数根（R(x)=0），并回代穷举少量 y 候选验证 F(x,y)≡0(mod N)
-    candidates = set()
-    for x0 in range(-X + 1, X):
-        # R 可能仅差常数因子；以 R(x0)=0 判断
-        valR = 0
-        x0_pow = 1
-        for ci in R:
-            valR += ci * x0_pow
-            x0_pow *= x0
-        if valR != 0:
-            continue
-        # 小范围枚举 y
-        for y0 in range(-Y + 1, Y):
-            total = 0
-            for (ix, iy), v in F.items():
-                total += v * pow(x0, ix) * pow(y0, iy)
-            if total % N == 0:
-                candidates.add((x0, y0))
+    with stage(stats, "resultant"):
+        R = resultant_in_x(G1, G2, X, Y, resultant, stats)
+    if stats is not None:
+        stats.max_bits("resultant", max((abs(c) for c in R), default=0))
+
+    # R(x)=0 的整数根直接在 Z 上求解（Hensel 提升），再把 x0 代入 G1/G2，
+    # 对 y 的一元整数多项式取 gcd 并求整数根；回代代价与 Y 无关
+    with stage(stats, "extract"):
+        Rp = from_coeffs(R)
+        xs = integer_roots(Rp, X - 1) if Rp else range(-X + 1, X)
+        candidates = set()
+        for x0 in xs:
+            for y0 in _recover_y(G1, G2, F, N, x0, Y):
+                if bivar_eval_at(F, x0, y0) % N == 0:
+                    candidates.add((x0, y0))
+    if stats is not None:
+        # R ≡ 0 时回退为逐个 x 扫描，x_candidates 会接近 2X
+        stats.count("x_candidates", len(xs))
+        stats.count("x_scan_fallback", 0 if Rp else 1)
     return sorted(candidates)
+
+
+def _univar_y_at(G: BivarFrac, x0: int) -> Poly:
+    coeffs, _D = clear_denominators(bivar_frac_eval_x_get_univar_y(G, x0))
+    return from_coeffs(coeffs)
+
+
+def _recover_y(G1: BivarFrac, G2: BivarFrac, F: Bivar, N: int, x0: int, Y: int) -> list[int]:
+    """Return candidate y0 (|y0|<Y) with G1(x0,y0)=G2(x0,y0)=0."""
+    P1 = _univar_y_at(G1, x0)
+    P2 = _univar_y_at(G2, x0)
+    if P1 and P2:
+        g = gcd_poly(P1, P2)
+        if degree(g) >= 1:
+            return integer_roots(g, Y - 1)
+        return []
+    P = P1 or P2
+    if P:
+        return integer_roots(P, Y - 1)
+    # 退化：G1,G2 在 x0 处都恒为 0，不提供 y 的信息，改为直接解 F(x0, y) ≡ 0 (mod N)
+    return _solve_f_at_x0(F, N, x0, Y)
+
+
+def _solve_f_at_x0(F: Bivar, N: int, x0: int, Y: int) -> list[int]:
+    # 整数根（F 在 Z 上为零的模型，如高位分解）+ 单变量 Coppersmith（界 Y）；
+    # 只有 F(x0, y) ≡ 0 (mod N) 恒成立时才需要列出全部 |y|<Y
+    coeffs = [0] * (degree_y(F) + 1)
+    for (i, j), v in F.items():
+        coeffs[j] += v * x0**i
+    P = from_coeffs(coeffs)
+    roots = set(integer_roots(P, Y - 1)) if P else set()
+    reduced = from_coeffs([c % N for c in coeffs])
+    if not reduced:
+        return list(range(-Y + 1, Y))
+    if degree(reduced) < 1:
+        return sorted(roots)
+    try:
+        monic = make_monic_mod(to_coeffs(reduced), N)
+    except ValueError:
+        # lc(F(x0, y)) 与 N 不互素：只保留整数根
+        return sorted(roots)
+    roots.update(find_small_roots_univariate(monic, N, Y, m="auto"))
+    return sorted(roots)
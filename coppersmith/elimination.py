@@ -2,6 +2,18 @@ from __future__ import annotations
 
 from fractions import Fraction
 
+from .instances import is_probable_prime
+from .poly import (
+    Poly,
+    div_exact,
+    mul as poly_mul,
+    pow_poly,
+    scale as poly_scale,
+    sub as poly_sub,
+    to_coeffs as poly_to_coeffs,
+)
+from .stats import SolveStats
+
 # 消元与结果式工具（不依赖外部库）
 # - 针对二元多项式的“按 y 视作一元”结果式 R(x)
 # - 通过多点取值与插值恢复 R(x)（避免在 Z[x] 上直接行列式）
@@ -153,6 +165,41 @@ def lagrange_interpolate(points: list[tuple[int, int]]) -> list[int]:
     return [int(c) for c in normalize_fraction_coeffs(coeffs)]
 
 
+def newton_interpolate(points: list[tuple[int, int]]) -> list[int]:
+    """Newton 差商插值（O(n^2)，纯整数），输出与 ``lagrange_interpolate`` 完全一致。
+
+    整数系数多项式在整数节点上的差商都是整数，故逐层做精确整除即可；
+    若某层不能整除（插值多项式有非整数系数），回退到 Fraction 版拉格朗日插值。
+    """
+    from math import gcd
+
+    n = len(points)
+    if n == 0:
+        return [0]
+    xs = [x for x, _ in points]
+    c = [y for _, y in points]
+    for j in range(1, n):
+        for i in range(n - 1, j - 1, -1):
+            q, r = divmod(c[i] - c[i - 1], xs[i] - xs[i - j])
+            if r:
+                return lagrange_interpolate(points)
+            c[i] = q
+    # Newton 形式展开为升幂系数：out = (...(c[n-1](x-x[n-2]) + c[n-2])...)
+    out = [0] * n
+    for i in range(n - 1, -1, -1):
+        for k in range(n - 1, 0, -1):
+            out[k] = out[k - 1] - xs[i] * out[k]
+        out[0] = c[i] - xs[i] * out[0]
+    while len(out) > 1 and out[-1] == 0:
+        out.pop()
+    g = 0
+    for v in out:
+        g = gcd(g, abs(v))
+    if g > 1:
+        out = [v // g for v in out]
+    return out
+
+
 def poly_add_frac(a: list[Fraction], b: list[Fraction]) -> list[Fraction]:
     n = max(len(a), len(b))
     out = [Fraction(0) for _ in range(n)]
@@ -199,16 +246,23 @@ def eval_int_poly(coeffs: list[int], x: int) -> int:
     return total
 
 
-def resultant_in_x_by_interpolation(G1: BivarFrac, G2: BivarFrac, X: int, Y: int) -> list[int]:
+def resultant_in_x_by_interpolation(
+    G1: BivarFrac, G2: BivarFrac, X: int, Y: int, stats: SolveStats | None = None
+) -> list[int]:
     """计算关于 y 的结果式 R(x)，返回整数多项式（升幂系数）。
-    方法：选取一批 x0 点，专化得到一元多项式 P1(y),P2(y)（分数系数），清分母为整数后求整数结果式；
-    收集 (x0, R'(x0)) 点，用拉格朗日插值重建 R'(x)；该 R'(x) 与真 R(x) 仅差一个非零常数因子。
+    方法：先整体清分母得到整数二元多项式，选取一批 x0 点专化得到一元多项式 P1(y),P2(y)，
+    求整数结果式；收集 (x0, R'(x0)) 点，用拉格朗日插值重建 R'(x)；该 R'(x) 与真 R(x)
+    仅差一个非零常数因子。stats 非 None 时累加采样点数 resultant_samples。
+    注意：清分母必须对整个 G 一次完成（逐点清分母/约公因子会让每个点差不同的常数），
+    且须跳过 y 次数下降的专化点（Sylvester 矩阵尺寸会变）。
     """
+    I1 = {k: Fraction(v) for k, v in bivar_frac_to_int(G1).items()}
+    I2 = {k: Fraction(v) for k, v in bivar_frac_to_int(G2).items()}
     # 度数上界：deg_x(R) ≤ deg_y(G1)*deg_x(G2) + deg_y(G2)*deg_x(G1)
-    dxy1 = deg_x_bivar_frac(G1)
-    dyy1 = deg_y_bivar_frac(G1)
-    dxy2 = deg_x_bivar_frac(G2)
-    dyy2 = deg_y_bivar_frac(G2)
+    dxy1 = deg_x_bivar_frac(I1)
+    dyy1 = deg_y_bivar_frac(I1)
+    dxy2 = deg_x_bivar_frac(I2)
+    dyy2 = deg_y_bivar_frac(I2)
     deg_bound = max(0, dyy1 * dxy2 + dyy2 * dxy1)
 
     # 选择采样点（尽量小整数，覆盖 [-X-2, X+2] 范围）
@@ -222,23 +276,23 @@ def resultant_in_x_by_interpolation(G1: BivarFrac, G2: BivarFrac, X: int, Y: int
         if x0 in used:
             continue
         used.add(x0)
-        # 专化并清分母
-        p1_y = bivar_frac_eval_x_get_univar_y(G1, x0)
-        p2_y = bivar_frac_eval_x_get_univar_y(G2, x0)
-        int_p1, D1 = clear_denominators(p1_y)
-        int_p2, D2 = clear_denominators(p2_y)
-        if len(int_p1) == 0 or len(int_p2) == 0:
+        # 专化（系数已是整数）
+        p1_y = bivar_frac_eval_x_get_univar_y(I1, x0)
+        p2_y = bivar_frac_eval_x_get_univar_y(I2, x0)
+        if len(p1_y) != dyy1 + 1 or len(p2_y) != dyy2 + 1 or p1_y[-1] == 0 or p2_y[-1] == 0:
             continue
         # 求整数结果式
-        r_val = resultant_int_y(int_p1, int_p2)
+        r_val = resultant_int_y([int(c) for c in p1_y], [int(c) for c in p2_y])
         samples.append((x0, r_val))
         if len(samples) >= needed:
             break
+    if stats is not None:
+        stats.count("resultant_samples", len(samples))
     if len(samples) < needed:
         # 退化：直接返回常数多项式
         return [0, 0, 1][:1]  # [0]
 
-    coeffs = lagrange_interpolate(samples)
+    coeffs = newton_interpolate(samples)
     # 归一化：去除系数的最大公因子
     from math import gcd
 
@@ -248,3 +302,370 @@ def resultant_in_x_by_interpolation(G1: BivarFrac, G2: BivarFrac, X: int, Y: int
     if g > 1:
         coeffs = [v // g for v in coeffs]
     return coeffs
+
+
+# ----------------- 多模（CRT）结果式 -----------------
+# 1) 全局清分母：G1,G2 → 整数二元多项式 A,B（结果式只差非零常数因子）
+# 2) 对若干素数 p（位数见 CRT_PRIME_BITS）：在 x=0,1,2,... 处用 Horner 专化 A,B mod p，
+#    以伪余式 Euclid 求 Res_y mod p，再在 F_p 上做 Newton 插值得到 R(x) mod p
+# 3) CRT 合并，直到素数乘积超过 2·(系数界)，或新素数不再改变任何系数（提前终止）；系数界取
+#    ||Res||_∞ ≤ ||A||_1^{deg_y B} · ||B||_1^{deg_y A}（Sylvester 矩阵逐行 l1 范数之积）
+
+BivarInt = dict[tuple[int, int], int]
+
+_CRT_PRIMES: dict[int, list[int]] = {}
+# 素数位数：纯 Python 下每次模运算的解释器开销远大于大整数运算本身，用少量较大的素数代替
+# 许多字长素数能成倍减少运算次数；实测 256 位以上单次运算变贵，总耗时反而上升
+CRT_PRIME_BITS = (61, 128, 256)
+
+
+def crt_primes(count: int, bits: int = 61) -> list[int]:
+    """Return the first `count` primes below 2^bits, in decreasing order (cached per size)."""
+    primes = _CRT_PRIMES.setdefault(bits, [])
+    cand = primes[-1] - 2 if primes else (1 << bits) - 1
+    while len(primes) < count:
+        if is_probable_prime(cand):
+            primes.append(cand)
+        cand -= 2
+    return primes[:count]
+
+
+def bivar_frac_to_int(F: BivarFrac) -> BivarInt:
+    """Clear all denominators of F at once and remove the integer content."""
+    from math import gcd
+
+    D = 1
+    for c in F.values():
+        D = D * c.denominator // gcd(D, c.denominator)
+    out = {k: int(c * D) for k, c in F.items() if c != 0}
+    g = 0
+    for v in out.values():
+        g = gcd(g, v)
+    if g > 1:
+        out = {k: v // g for k, v in out.items()}
+    return out
+
+
+def det_mod_p(A: list[list[int]], p: int) -> int:
+    """Determinant of A modulo prime p by Gaussian elimination. A is not modified."""
+    n = len(A)
+    M = [[v % p for v in row] for row in A]
+    det = 1
+    for k in range(n):
+        piv = next((r for r in range(k, n) if M[r][k]), None)
+        if piv is None:
+            return 0
+        if piv != k:
+            M[k], M[piv] = M[piv], M[k]
+            det = -det
+        pk = M[k][k]
+        det = det * pk % p
+        inv = pow(pk, -1, p)
+        rowk = M[k]
+        for i in range(k + 1, n):
+            f = M[i][k] * inv % p
+            if f:
+                rowi = M[i]
+                for j in range(k + 1, n):
+                    rowi[j] = (rowi[j] - f * rowk[j]) % p
+    return det % p
+
+
+def _x_columns_mod(F: BivarInt, dy: int, p: int) -> list[list[int]]:
+    # 按 y 次数分组的 x 系数（降幂，供 Horner），全部预先取模 p
+    dx = max(ix for (ix, _iy) in F)
+    cols = [[0] * (dx + 1) for _ in range(dy + 1)]
+    for (ix, iy), c in F.items():
+        cols[iy][dx - ix] = c % p
+    return cols
+
+
+def _univar_y_mod(cols: list[list[int]], x0: int, p: int) -> list[int]:
+    out = []
+    for col in cols:
+        acc = 0
+        for c in col:
+            acc = (acc * x0 + c) % p
+        out.append(acc)
+    return out
+
+
+def resultant_univar_mod(a: list[int], b: list[int], p: int) -> int:
+    """Res(a, b) mod prime p for ascending coefficient lists with nonzero leading terms.
+
+    Euclidean algorithm with pseudo-remainders r = lc(b)^{δ+1}·a mod b (δ = deg a - deg b):
+    Res(a, b) = (-1)^{deg a·deg b} lc(b)^{deg a - deg r - (δ+1)·deg b} Res(b, r). The
+    negative powers are collected in a denominator and inverted once at the end, so
+    the cost is O(deg a·deg b) multiplications instead of a Sylvester determinant.
+    """
+    a = [v % p for v in a]
+    b = [v % p for v in b]
+    num = den = 1
+    while True:
+        da, db = len(a) - 1, len(b) - 1
+        if db == 0:
+            return num * pow(b[0], da, p) * pow(den, -1, p) % p
+        lc = b[-1]
+        r = a[:]
+        for k in range(da - db, -1, -1):
+            q = r[k + db]
+            for j in range(k + db):
+                r[j] = r[j] * lc % p
+            if q:
+                for j in range(db):
+                    r[k + j] = (r[k + j] - q * b[j]) % p
+        # 高于 k+db 的项已消去；未消去的低位项也已各乘 lc 共 δ+1 次
+        r = r[:db]
+        while r and r[-1] == 0:
+            r.pop()
+        if not r:
+            return 0
+        if da & 1 and db & 1:
+            num = -num
+        num = num * pow(lc, da - (len(r) - 1), p) % p
+        den = den * pow(lc, max(da - db + 1, 0) * db, p) % p
+        a, b = b, r
+
+
+def newton_interpolate_mod(xs: list[int], ys: list[int], p: int) -> list[int]:
+    """Interpolate ascending coefficients mod p through (xs[i], ys[i]) in O(n^2)."""
+    n = len(xs)
+    c = [y % p for y in ys]
+    # 差商；采样点多为连续整数，xs[i]-xs[i-j] 取值很少，逆元按差值缓存
+    inverses: dict[int, int] = {}
+    for j in range(1, n):
+        for i in range(n - 1, j - 1, -1):
+            diff = xs[i] - xs[i - j]
+            inv = inverses.get(diff)
+            if inv is None:
+                inv = inverses[diff] = pow(diff, -1, p)
+            c[i] = (c[i] - c[i - 1]) * inv % p
+    # 由 Newton 形式展开为升幂系数（Horner）
+    out = [0] * n
+    for i in range(n - 1, -1, -1):
+        # out = out * (x - xs[i]) + c[i]
+        for k in range(n - 1, 0, -1):
+            out[k] = (out[k - 1] - xs[i] * out[k]) % p
+        out[0] = (c[i] - xs[i] * out[0]) % p
+    return out
+
+
+def _resultant_mod_p(A: BivarInt, B: BivarInt, deg_bound: int, p: int) -> list[int] | None:
+    """R(x) = Res_y(A, B) mod p via evaluation/interpolation; None if p is unlucky."""
+    dyA = max(iy for (_ix, iy) in A)
+    dyB = max(iy for (_ix, iy) in B)
+    # 首项系数 lc_y(x) 在 F_p 上恒为 0 时该素数不可用
+    if all(c % p == 0 for (_ix, iy), c in A.items() if iy == dyA):
+        return None
+    if all(c % p == 0 for (_ix, iy), c in B.items() if iy == dyB):
+        return None
+    colsA = _x_columns_mod(A, dyA, p)
+    colsB = _x_columns_mod(B, dyB, p)
+    xs: list[int] = []
+    ys: list[int] = []
+    x0 = 0
+    while len(xs) < deg_bound + 1:
+        if x0 >= p:
+            return None
+        pa = _univar_y_mod(colsA, x0, p)
+        pb = _univar_y_mod(colsB, x0, p)
+        # 跳过 y 次数下降的专化点（结果式的形式次数会变）
+        if pa[-1] and pb[-1]:
+            xs.append(x0)
+            ys.append(resultant_univar_mod(pa, pb, p))
+        x0 += 1
+    return newton_interpolate_mod(xs, ys, p)
+
+
+def resultant_in_x_modular(
+    G1: BivarFrac, G2: BivarFrac, X: int, Y: int, stats: SolveStats | None = None
+) -> list[int]:
+    """Res_y(G1, G2) up to a constant factor, via evaluation mod primes and CRT.
+
+    Same contract as ``resultant_in_x_by_interpolation`` (X, Y are accepted for
+    signature compatibility); coefficients are reconstructed once the product of
+    primes exceeds twice the Hadamard-type coefficient bound, or earlier when an
+    extra prime leaves every coefficient unchanged. ``stats`` counts the primes used
+    and the evaluation points over all of them.
+    """
+    from math import gcd
+
+    A = bivar_frac_to_int(G1)
+    B = bivar_frac_to_int(G2)
+    if not A or not B:
+        return [0]
+    dxA = max(ix for (ix, _iy) in A)
+    dyA = max(iy for (_ix, iy) in A)
+    dxB = max(ix for (ix, _iy) in B)
+    dyB = max(iy for (_ix, iy) in B)
+    deg_bound = max(0, dyA * dxB + dyB * dxA)
+    normA = sum(abs(v) for v in A.values())
+    normB = sum(abs(v) for v in B.values())
+    bound = normA**dyB * normB**dyA
+
+    need = (2 * bound).bit_length() + 1
+    bits = next((b for b in CRT_PRIME_BITS if b >= need), CRT_PRIME_BITS[-1])
+
+    coeffs = [0] * (deg_bound + 1)
+    M = 1
+    idx = 0
+    while M <= 2 * bound:
+        idx += 1
+        p = crt_primes(idx, bits)[-1]
+        rp = _resultant_mod_p(A, B, deg_bound, p)
+        if rp is None:
+            continue
+        if stats is not None:
+            stats.count("resultant_primes")
+            stats.count("resultant_samples", deg_bound + 1)
+        # CRT：coeffs ≡ 旧值 (mod M)，≡ rp (mod p)；coeffs 保持对称表示
+        inv = pow(M, -1, p)
+        Mp = M * p
+        stable = M > 1
+        for i in range(deg_bound + 1):
+            t = (rp[i] - coeffs[i]) * inv % p
+            if t:
+                stable = False
+                c = coeffs[i] + M * t
+                coeffs[i] = c - Mp if 2 * c > Mp else c
+        M = Mp
+        # 提前终止：新素数没有改变任何系数，重建值大概率已是真值（误判概率约 p^-(n+1)）
+        if stable:
+            break
+    while len(coeffs) > 1 and coeffs[-1] == 0:
+        coeffs.pop()
+    g = 0
+    for v in coeffs:
+        g = gcd(g, abs(v))
+    if g > 1:
+        coeffs = [v // g for v in coeffs]
+    return coeffs
+
+
+# ----------------- 子结果式 PRS（直接在 Z[x][y] 上，无采样） -----------------
+# Cohen《A Course in Computational Algebraic Number Theory》Algorithm 3.3.7：
+# 视 A,B 为系数在 Z[x] 中的关于 y 的多项式，伪除得余式序列，每步用 g·h^δ 精确整除
+# 控制系数膨胀；最后一个非零常数（关于 y）即结果式。
+
+YPoly = list[Poly]  # 升幂（关于 y），每个系数是 Z[x] 中的 dict 多项式
+
+
+def _bivar_int_to_ypoly(F: BivarInt) -> YPoly:
+    dy = max((iy for (_ix, iy) in F), default=-1)
+    out: YPoly = [{} for _ in range(dy + 1)]
+    for (ix, iy), c in F.items():
+        out[iy][ix] = c
+    return out
+
+
+def _ypoly_trim(a: YPoly) -> YPoly:
+    while a and not a[-1]:
+        a.pop()
+    return a
+
+
+def _ypoly_prem(a: YPoly, b: YPoly) -> YPoly:
+    # prem(a, b) = lc(b)^(deg a - deg b + 1) · a mod b（系数在 Z[x]）
+    db = len(b) - 1
+    lb = b[-1]
+    r = [dict(c) for c in a]
+    e = len(a) - len(b) + 1
+    while len(r) - 1 >= db and r:
+        dr = len(r) - 1
+        lr = r[-1]
+        off = dr - db
+        r = [poly_mul(c, lb) for c in r]
+        for i, bi in enumerate(b):
+            r[off + i] = poly_sub(r[off + i], poly_mul(lr, bi))
+        r = _ypoly_trim(r)
+        e -= 1
+    if e > 0:
+        le = pow_poly(lb, e)
+        r = [poly_mul(c, le) for c in r]
+    return r
+
+
+def resultant_subresultant(A: BivarInt, B: BivarInt) -> Poly:
+    """Res_y(A, B) in Z[x] by the subresultant PRS (exact, sign included)."""
+    a = _ypoly_trim(_bivar_int_to_ypoly(A))
+    b = _ypoly_trim(_bivar_int_to_ypoly(B))
+    if not a or not b:
+        return {}
+    s = 1
+    if len(a) < len(b):
+        a, b = b, a
+        if (len(a) - 1) % 2 == 1 and (len(b) - 1) % 2 == 1:
+            s = -s
+    g: Poly = {0: 1}
+    h: Poly = {0: 1}
+    while len(b) > 1:
+        da = len(a) - 1
+        db = len(b) - 1
+        delta = da - db
+        if da % 2 == 1 and db % 2 == 1:
+            s = -s
+        r = _ypoly_prem(a, b)
+        if not r:
+            return {}
+        a = b
+        div = poly_mul(g, pow_poly(h, delta))
+        b = [div_exact(c, div) for c in r]
+        g = a[-1]
+        if delta > 0:
+            h = div_exact(pow_poly(g, delta), pow_poly(h, delta - 1))
+    # b 为关于 y 的非零常数
+    da = len(a) - 1
+    if da == 0:
+        return {0: s}
+    res = div_exact(pow_poly(b[0], da), pow_poly(h, da - 1))
+    return poly_scale(res, s)
+
+
+def resultant_in_x_subresultant(
+    G1: BivarFrac, G2: BivarFrac, X: int, Y: int, stats: SolveStats | None = None
+) -> list[int]:
+    """Res_y(G1, G2) up to a constant factor via the subresultant PRS over Z[x][y].
+
+    Same contract as ``resultant_in_x_by_interpolation``; X, Y and stats are unused
+    (no sampling takes place).
+    """
+    from math import gcd
+
+    A = bivar_frac_to_int(G1)
+    B = bivar_frac_to_int(G2)
+    coeffs = poly_to_coeffs(resultant_subresultant(A, B))
+    g = 0
+    for v in coeffs:
+        g = gcd(g, abs(v))
+    if g > 1:
+        coeffs = [v // g for v in coeffs]
+    return coeffs
+
+
+RESULTANT_METHODS = {
+    "modular": resultant_in_x_modular,
+    "interpolation": resultant_in_x_by_interpolation,
+    "subresultant": resultant_in_x_subresultant,
+}
+
+
+def resultant_in_x(
+    G1: BivarFrac,
+    G2: BivarFrac,
+    X: int,
+    Y: int,
+    method: str = "modular",
+    stats: SolveStats | None = None,
+) -> list[int]:
+    """Res_y(G1, G2) as an integer polynomial in x, computed with the named method.
+
+    ``stats`` (optional) receives the sample/prime counts of the sampling methods.
+
+    Raises:
+      ValueError: if method is unknown
+    """
+    try:
+        fn = RESULTANT_METHODS[method]
+    except KeyError:
+        raise ValueError(f"unknown resultant method: {method!r}") from None
+    return fn(G1, G2, X, Y, stats)
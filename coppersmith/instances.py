@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from math import comb, gcd
+from pathlib import Path
+
+from .bivar import Bivar
+
+# 带种子的实例生成：Miller–Rabin 素数、任意位数的 RSA 模数与常见场景模型。
+# - 素性：先用小素数试除，再以前 13 个素数为底做 Miller–Rabin。对 n < 3.3·10^24 这组底
+#   是确定性的；更大的 n 上仍是固定底（结果可复现），随机候选被误判的概率远低于 2^-80
+# - 可复现：同一 (位数, 种子, e) 总是得到同一个模数；不传 rng 时使用全局 random 状态，
+#   与 random.seed(...) 配合即可替代各测试/示例里的试除 gen_prime
+# - 磁盘缓存：DISK_CACHE_MIN_BITS 位及以上的模数按参数写入缓存目录（环境变量
+#   COPPERSMITH_CACHE_DIR，缺省 ~/.cache/coppersmith/instances），先写临时文件再 os.replace
+
+DISK_CACHE_MIN_BITS = 256
+CACHE_ENV = "COPPERSMITH_CACHE_DIR"
+CACHE_VERSION = 1
+
+_SMALL_PRIMES = (
+    3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97,
+)  # fmt: skip
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def is_probable_prime(n: int) -> bool:
+    """Miller–Rabin with the first 13 prime bases (exact for n < 3.3·10^24)."""
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    for p in _SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def random_prime(bits: int, rng: random.Random | None = None) -> int:
+    """Return a prime of exactly ``bits`` bits (top bit set).
+
+    Draws from ``rng``, or from the global ``random`` state when rng is None.
+
+    Raises:
+      ValueError: if bits < 2
+    """
+    if bits < 2:
+        raise ValueError("bits must be >= 2")
+    getrandbits = random.getrandbits if rng is None else rng.getrandbits
+    if bits == 2:
+        return 2 + getrandbits(1)
+    while True:
+        n = getrandbits(bits) | (1 << (bits - 1)) | 1
+        if is_probable_prime(n):
+            return n
+
+
+@dataclass(frozen=True)
+class RSAModulus:
+    """N = p·q with p the smaller factor; e (if given) is coprime to (p-1)(q-1)."""
+
+    N: int
+    p: int
+    q: int
+    e: int | None = None
+
+
+def cache_dir() -> Path:
+    """Directory of the on-disk instance cache."""
+    env = os.environ.get(CACHE_ENV)
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "coppersmith" / "instances"
+
+
+def rsa_modulus(
+    bits: int, seed: int | str = 0, e: int | None = None, cache: bool = True
+) -> RSAModulus:
+    """Deterministic RSA modulus of exactly ``bits`` bits for the given seed.
+
+    Moduli of at least ``DISK_CACHE_MIN_BITS`` bits are cached on disk (see
+    ``cache_dir``) unless ``cache`` is False; all are cached in memory.
+
+    Raises:
+      ValueError: if bits < 5, e is even or < 3, or no such modulus exists
+        (e.g. bits <= 8 with e=3)
+    """
+    if bits < 5:
+        # 4 位的两个 2 位素数之积最多 9，取不满 4 位，生成循环不会结束
+        raise ValueError("bits must be >= 5")
+    if e is not None and (e < 3 or e % 2 == 0):
+        raise ValueError("e must be an odd integer >= 3")
+    if bits < _EXHAUSTIVE_BITS and not _modulus_exists(bits, e):
+        raise ValueError(f"no {bits}-bit RSA modulus with e={e}")
+    if not cache or bits < DISK_CACHE_MIN_BITS:
+        return _rsa_modulus_memo(bits, seed, e)
+    path = cache_dir() / f"rsa-{bits}-{e or 0}-{seed}.json"
+    cached = _load_modulus(path, bits, e)
+    if cached is not None:
+        return cached
+    key = _rsa_modulus_memo(bits, seed, e)
+    _save_modulus(path, key)
+    return key
+
+
+# 位数很小时可取的素数对有限，先穷举确认存在解（否则抽样循环不会结束）
+_EXHAUSTIVE_BITS = 16
+
+
+def _modulus_exists(bits: int, e: int | None) -> bool:
+    half = bits // 2
+    ps = [p for p in range(1 << (half - 1), 1 << half) if is_probable_prime(p)]
+    qs = [q for q in range(1 << (bits - half - 1), 1 << (bits - half)) if is_probable_prime(q)]
+    return any(
+        p != q and (p * q).bit_length() == bits and (e is None or gcd(e, (p - 1) * (q - 1)) == 1)
+        for p in ps
+        for q in qs
+    )
+
+
+@lru_cache(maxsize=128)
+def _rsa_modulus_memo(bits: int, seed: int | str, e: int | None) -> RSAModulus:
+    rng = random.Random(f"rsa:{bits}:{e}:{seed}")
+    half = bits // 2
+    while True:
+        p = random_prime(half, rng)
+        q = random_prime(bits - half, rng)
+        N = p * q
+        # 两个素数最高位都为 1 时乘积可能少 1 位，重新抽取
+        if p == q or N.bit_length() != bits:
+            continue
+        if e is not None and gcd(e, (p - 1) * (q - 1)) != 1:
+            continue
+        p, q = min(p, q), max(p, q)
+        return RSAModulus(N, p, q, e)
+
+
+def _load_modulus(path: Path, bits: int, e: int | None) -> RSAModulus | None:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != CACHE_VERSION:
+        return None
+    key = RSAModulus(payload["N"], payload["p"], payload["q"], payload["e"])
+    # 损坏或不匹配的缓存直接忽略（随后重新生成并覆盖）
+    if key.p * key.q != key.N or key.N.bit_length() != bits or key.e != e:
+        return None
+    return key
+
+
+def _save_modulus(path: Path, key: RSAModulus) -> None:
+    payload = {"version": CACHE_VERSION, "N": key.N, "p": key.p, "q": key.q, "e": key.e}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        # 缓存只是加速，不可写时照常返回
+        pass
+
+
+# ----------------- 场景模型 -----------------
+
+
+@dataclass(frozen=True)
+class SmallEMessage:
+    """c = m^e mod N with a short message m < X (textbook RSA, no padding)."""
+
+    N: int
+    e: int
+    c: int
+    m: int
+    X: int
+
+    def poly(self) -> list[int]:
+        """Ascending coefficients of x^e - c (root m mod N)."""
+        return [-self.c % self.N] + [0] * (self.e - 1) + [1]
+
+
+def small_e_message(
+    bits: int, e: int = 3, msg_bits: int | None = None, seed: int | str = 0
+) -> SmallEMessage:
+    """Small-exponent instance; msg_bits defaults to 8 bits below N^{1/e}."""
+    key = rsa_modulus(bits, seed, e)
+    if msg_bits is None:
+        msg_bits = max(bits // e - 8, 2)
+    rng = random.Random(f"small-e:{bits}:{e}:{msg_bits}:{seed}")
+    m = rng.getrandbits(msg_bits) | (1 << (msg_bits - 1))
+    return SmallEMessage(key.N, e, pow(m, e, key.N), m, 1 << msg_bits)
+
+
+@dataclass(frozen=True)
+class PartialPBits:
+    """N = p·q with the high bits of p known: p = p0 + x, 0 <= x < X = 2^unknown_bits."""
+
+    N: int
+    p: int
+    q: int
+    p0: int
+    unknown_bits: int
+
+    @property
+    def X(self) -> int:
+        return 1 << self.unknown_bits
+
+    @property
+    def beta(self) -> float:
+        """An exponent with p >= N^beta (p has at least half the bits of N, minus one)."""
+        return (self.p.bit_length() - 1) / self.N.bit_length()
+
+    def poly(self) -> list[int]:
+        """f(x) = p0 + x, a root modulo the unknown divisor p (use with ``beta``)."""
+        return [self.p0, 1]
+
+    def bivar(self) -> Bivar:
+        """F(x, y) = (p0 + x)(q0 + y) - N with q0 = N // p0 (root (x, q - q0))."""
+        q0 = self.N // self.p0
+        return {(1, 1): 1, (1, 0): q0, (0, 1): self.p0, (0, 0): self.p0 * q0 - self.N}
+
+
+def partial_p_bits(bits: int, unknown_bits: int, seed: int | str = 0) -> PartialPBits:
+    """Factoring instance where the low ``unknown_bits`` bits of p are unknown.
+
+    Raises:
+      ValueError: if unknown_bits is not in [1, bits // 2)
+    """
+    if not 1 <= unknown_bits < bits // 2:
+        raise ValueError("need 1 <= unknown_bits < bits // 2")
+    key = rsa_modulus(bits, seed)
+    p0 = key.p >> unknown_bits << unknown_bits
+    return PartialPBits(key.N, key.p, key.q, p0, unknown_bits)
+
+
+@dataclass(frozen=True)
+class HastadBroadcast:
+    """The same m encrypted under e pairwise coprime moduli with exponent e."""
+
+    e: int
+    moduli: tuple[int, ...]
+    ciphertexts: tuple[int, ...]
+    m: int
+
+
+def hastad_broadcast(bits: int, e: int = 3, seed: int | str = 0) -> HastadBroadcast:
+    """Håstad broadcast instance: e moduli of ``bits`` bits and m < min(moduli)."""
+    moduli: list[int] = []
+    i = 0
+    while len(moduli) < e:
+        N = rsa_modulus(bits, f"{seed}:hastad:{i}", e).N
+        i += 1
+        if all(gcd(N, other) == 1 for other in moduli):
+            moduli.append(N)
+    rng = random.Random(f"hastad:{bits}:{e}:{seed}")
+    m = rng.randrange(2, min(moduli))
+    return HastadBroadcast(e, tuple(moduli), tuple(pow(m, e, N) for N in moduli), m)
+
+
+@dataclass(frozen=True)
+class StereotypedMessage:
+    """m = prefix·2^k + x with a known prefix and k = unknown_bits unknown low bits."""
+
+    N: int
+    e: int
+    c: int
+    prefix: int
+    unknown_bits: int
+    x: int
+
+    @property
+    def X(self) -> int:
+        return 1 << self.unknown_bits
+
+    def poly(self) -> list[int]:
+        """Ascending coefficients of (prefix·2^k + x)^e - c mod N (monic, root self.x)."""
+        a = (self.prefix << self.unknown_bits) % self.N
+        coeffs = [comb(self.e, i) * pow(a, self.e - i, self.N) % self.N for i in range(self.e + 1)]
+        coeffs[0] = (coeffs[0] - self.c) % self.N
+        return coeffs
+
+
+def stereotyped_message(
+    bits: int, unknown_bits: int, e: int = 3, seed: int | str = 0
+) -> StereotypedMessage:
+    """Stereotyped-message instance; the full message spans about ``bits - 8`` bits.
+
+    Raises:
+      ValueError: if unknown_bits is not in [1, bits - 8)
+    """
+    if not 1 <= unknown_bits < bits - 8:
+        raise ValueError("need 1 <= unknown_bits < bits - 8")
+    key = rsa_modulus(bits, seed, e)
+    rng = random.Random(f"stereotyped:{bits}:{unknown_bits}:{e}:{seed}")
+    prefix_bits = bits - 8 - unknown_bits
+    prefix = rng.getrandbits(prefix_bits) | (1 << (prefix_bits - 1))
+    x = rng.getrandbits(unknown_bits)
+    m = (prefix << unknown_bits) + x
+    return StereotypedMessage(key.N, e, pow(m, e, key.N), prefix, unknown_bits, x)
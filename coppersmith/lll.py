@@ -1,6 +1,17 @@
 from __future__ import annotations
 
+import decimal
+import json
+import os
+from collections.abc import Callable
+from contextlib import nullcontext
+from dataclasses import dataclass
 from fractions import Fraction
+from math import log2
+from operator import mul
+from typing import Any
+
+from .stats import SolveStats
 
 # 简单整数 LLL 实现（列向量基或行向量基的一致性）
 # 这里使用“行向量”为基，输入为矩阵 rows: List[List[int]]
@@ -8,6 +19,8 @@ from fractions import Fraction
 
 Vector = list[Fraction]
 Matrix = list[Vector]
+# 提前终止钩子：k 前进后以 (B, k) 调用，此时 B[:k] 已是 LLL-约化前缀；返回 True 即停止约化
+StopHook = Callable[[list[list[int]], int], bool]
 
 
 def dot(a: Vector, b: Vector) -> Fraction:
@@ -95,3 +108,740 @@ def lll_reduction(B_int: list[list[int]], delta: Fraction = Fraction(3, 4)) -> l
 
     # 转回 int（四舍五入）
     return [[int(x) for x in row] for row in B]
+
+
+# ----------------- 整数版 LLL（增量 Gram–Schmidt） -----------------
+# de Weger / Cohen（Algorithm 2.6.7）整数 LLL：不再保存 Fraction 形式的 mu 与 |b*_i|^2，
+# 改为维护整数 d[i] 与 lam[k][j]：
+#   d[0] = 1, d[i+1] = |b*_0|^2 · ... · |b*_i|^2
+#   lam[k][j] = d[j+1] · mu[k][j]
+# size reduction 与交换只做 O(n) 次整数更新，无需重算整个 GS；全程精确除法，无数值误差。
+
+
+def _round_div(a: int, b: int) -> int:
+    """Return round(a / b) for b > 0 with ties to even (matches ``round(Fraction)``)."""
+    q, r = divmod(a, b)
+    twice = 2 * r
+    if twice > b or (twice == b and q & 1):
+        q += 1
+    return q
+
+
+def _dot_int(a: list[int], b: list[int]) -> int:
+    return sum(map(mul, a, b))
+
+
+def _int_gram_schmidt(B: list[list[int]]) -> tuple[list[int], list[list[int]]] | None:
+    """Compute integral GS data (d, lam) for the rows of B.
+
+    Returns None if the rows are linearly dependent (some d[i+1] == 0).
+    """
+    n = len(B)
+    d = [1] + [0] * n
+    lam = [[0] * n for _ in range(n)]
+    for k in range(n):
+        bk = B[k]
+        for j in range(k + 1):
+            bj = B[j]
+            u = _dot_int(bk, bj)
+            for i in range(j):
+                u = (d[i + 1] * u - lam[k][i] * lam[j][i]) // d[i]
+            if j < k:
+                lam[k][j] = u
+            else:
+                d[k + 1] = u
+        if d[k + 1] == 0:
+            return None
+    return d, lam
+
+
+def _int_size_reduce(
+    B: list[list[int]], d: list[int], lam: list[list[int]], k: int, ell: int
+) -> bool:
+    # 返回是否实际做了一次约化（供统计）
+    dl = d[ell + 1]
+    if 2 * abs(lam[k][ell]) <= dl:
+        return False
+    q = _round_div(lam[k][ell], dl)
+    bk = B[k]
+    bl = B[ell]
+    for j in range(len(bk)):
+        bk[j] -= q * bl[j]
+    lam[k][ell] -= q * dl
+    lk = lam[k]
+    ll = lam[ell]
+    for i in range(ell):
+        lk[i] -= q * ll[i]
+    return True
+
+
+def _int_swap(B: list[list[int]], d: list[int], lam: list[list[int]], k: int) -> None:
+    n = len(B)
+    B[k], B[k - 1] = B[k - 1], B[k]
+    for j in range(k - 1):
+        lam[k][j], lam[k - 1][j] = lam[k - 1][j], lam[k][j]
+    lk = lam[k][k - 1]
+    Bk = (d[k - 1] * d[k + 1] + lk * lk) // d[k]
+    for i in range(k + 1, n):
+        t = lam[i][k]
+        lam[i][k] = (d[k + 1] * lam[i][k - 1] - lk * t) // d[k]
+        lam[i][k - 1] = (Bk * t + lk * lam[i][k]) // d[k + 1]
+    d[k] = Bk
+
+
+# ----------------- 进度事件与断点续算（整数版 LLL） -----------------
+# 进度：当前 k、交换次数、log2 势函数 D = prod_{i=1}^{n-1} d[i]（每次交换严格下降，
+# 是 LLL 终止性证明中的量）与 log2 |b*_i| 轮廓。
+# 断点：整数版 LLL 的全部状态就是 (B, d, lam, k, swaps, delta)，都是整数，原样写成 JSON；
+# 先写临时文件再 os.replace，被杀进程时不会留下半个文件。
+
+REPORT_EVERY = 1000
+CHECKPOINT_EVERY = 10000
+CHECKPOINT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class LLLProgress:
+    """Snapshot of an integer LLL run.
+
+    Attributes:
+      k: current index of the LLL loop (rows < k form a reduced prefix)
+      swaps: swaps performed so far
+      log2_potential: log2 of prod_{i=1}^{n-1} d_i (strictly decreases with every swap)
+      profile: log2 |b*_i| for every row
+    """
+
+    k: int
+    swaps: int
+    log2_potential: float
+    profile: tuple[float, ...]
+
+
+ProgressHook = Callable[[LLLProgress], None]
+
+
+def _log2_int(v: int) -> float:
+    # 大整数的 log2：取最高 53 位换成 float，避免溢出
+    shift = max(v.bit_length() - 53, 0)
+    return log2(v >> shift) + shift
+
+
+def lll_progress(d: list[int], k: int, swaps: int) -> LLLProgress:
+    """Build an ``LLLProgress`` from the integral GS data d."""
+    logs = [_log2_int(x) for x in d]
+    n = len(d) - 1
+    profile = tuple((logs[i + 1] - logs[i]) / 2 for i in range(n))
+    return LLLProgress(k, swaps, sum(logs[1:n]), profile)
+
+
+@dataclass
+class _IntLLLState:
+    B: list[list[int]]
+    d: list[int]
+    lam: list[list[int]]
+    k: int
+    swaps: int
+    delta: Fraction
+
+
+def save_checkpoint(state: _IntLLLState, path: str | os.PathLike[str]) -> None:
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "delta": [state.delta.numerator, state.delta.denominator],
+        "k": state.k,
+        "swaps": state.swaps,
+        "B": state.B,
+        "d": state.d,
+        "lam": state.lam,
+    }
+    tmp = f"{os.fspath(path)}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh)
+    os.replace(tmp, path)
+
+
+def resume_lll(
+    path: str | os.PathLike[str],
+    stop: StopHook | None = None,
+    progress: ProgressHook | None = None,
+    report_every: int = REPORT_EVERY,
+    checkpoint_every: int = CHECKPOINT_EVERY,
+) -> list[list[int]]:
+    """Continue an integer LLL run from a checkpoint written by ``lll_reduction_int``.
+
+    Further checkpoints go to the same path. A checkpoint of a finished run returns its
+    basis immediately.
+
+    Raises:
+      ValueError: if the file is not a compatible checkpoint
+    """
+    with open(path, encoding="utf-8") as fh:
+        payload = json.load(fh)
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"unsupported LLL checkpoint version: {payload.get('version')!r}")
+    num, den = payload["delta"]
+    state = _IntLLLState(
+        payload["B"],
+        payload["d"],
+        payload["lam"],
+        payload["k"],
+        payload["swaps"],
+        Fraction(num, den),
+    )
+    if len(state.d) != len(state.B) + 1 or not 1 <= state.k <= len(state.B):
+        raise ValueError("corrupt LLL checkpoint")
+    return _int_lll_run(state, stop, progress, report_every, path, checkpoint_every)
+
+
+def lll_reduction_int(
+    B_int: list[list[int]],
+    delta: Fraction = Fraction(3, 4),
+    stop: StopHook | None = None,
+    progress: ProgressHook | None = None,
+    report_every: int = REPORT_EVERY,
+    checkpoint: str | os.PathLike[str] | None = None,
+    checkpoint_every: int = CHECKPOINT_EVERY,
+    stats: SolveStats | None = None,
+) -> list[list[int]]:
+    """LLL-reduce the rows of B_int using exact integer arithmetic only.
+
+    Same input/output contract (and, for independent rows, the same output) as
+    ``lll_reduction``, but Gram–Schmidt data is updated incrementally instead of being
+    recomputed after every step. Linearly dependent inputs fall back to ``lll_reduction``.
+    ``stop`` (see ``stop_when_short``) may end the reduction early once the LLL-reduced
+    prefix is good enough; the remaining rows are then left partially reduced.
+
+    Long runs can be observed and made restartable: ``progress`` receives an
+    ``LLLProgress`` every ``report_every`` swaps and once at the end; with ``checkpoint``
+    the full state (basis, GS data, k, swap count) is written to that path every
+    ``checkpoint_every`` swaps and at the end, and ``resume_lll`` continues from it.
+    ``stats`` (see ``coppersmith.stats``) accumulates swap and size-reduction counts.
+
+    Raises:
+      ValueError: if the rows are linearly dependent and any of ``stop``, ``progress``,
+        ``checkpoint`` or ``stats`` is given (the fallback supports none of them)
+    """
+    n = len(B_int)
+    if n == 0:
+        return []
+    B = [[int(x) for x in row] for row in B_int]
+    gs = _int_gram_schmidt(B)
+    if gs is None:
+        # Fraction 版没有增量 GS 状态：既不能写断点，也无法报告进度或计数
+        if any(h is not None for h in (stop, progress, checkpoint, stats)):
+            raise ValueError(
+                "linearly dependent basis: stop/progress/checkpoint/stats are not supported"
+            )
+        return lll_reduction(B_int, delta)
+    d, lam = gs
+    state = _IntLLLState(B, d, lam, 1, 0, delta)
+    return _int_lll_run(state, stop, progress, report_every, checkpoint, checkpoint_every, stats)
+
+
+def _int_lll_run(
+    state: _IntLLLState,
+    stop: StopHook | None,
+    progress: ProgressHook | None,
+    report_every: int,
+    checkpoint: str | os.PathLike[str] | None,
+    checkpoint_every: int,
+    stats: SolveStats | None = None,
+) -> list[list[int]]:
+    B, d, lam = state.B, state.d, state.lam
+    n = len(B)
+    dp, dq = state.delta.numerator, state.delta.denominator
+    k, swaps = state.k, state.swaps
+    swaps0 = swaps
+    reductions = 0
+    # 监控关闭时循环内只多一次整数比较
+    next_report = swaps + report_every if progress is not None else -1
+    next_save = swaps + checkpoint_every if checkpoint is not None else -1
+
+    while k < n:
+        reductions += _int_size_reduce(B, d, lam, k, k - 1)
+        # Lovász 条件（乘开分母）：d[k+1]·d[k-1] + lam^2 >= delta·d[k]^2
+        lk = lam[k][k - 1]
+        if dq * (d[k + 1] * d[k - 1] + lk * lk) >= dp * d[k] * d[k]:
+            for j in reversed(range(k - 1)):
+                reductions += _int_size_reduce(B, d, lam, k, j)
+            k += 1
+            if stop is not None and stop(B, k):
+                break
+        else:
+            _int_swap(B, d, lam, k)
+            k = max(k - 1, 1)
+            swaps += 1
+            if swaps == next_report and progress is not None:
+                progress(lll_progress(d, k, swaps))
+                next_report += report_every
+            if swaps == next_save and checkpoint is not None:
+                state.k, state.swaps = k, swaps
+                save_checkpoint(state, checkpoint)
+                next_save += checkpoint_every
+
+    state.k, state.swaps = k, swaps
+    if stats is not None:
+        stats.count("lll_swaps", swaps - swaps0)
+        stats.count("lll_size_reductions", reductions)
+    if progress is not None:
+        progress(lll_progress(d, k, swaps))
+    if checkpoint is not None:
+        save_checkpoint(state, checkpoint)
+    return B
+
+
+# ----------------- 浮点 L² LLL（Nguyen–Stehlé 思路） -----------------
+# Gram 矩阵 G 与基向量始终用精确整数维护；只有 Cholesky 分解 (r_ij, mu_ij) 用浮点：
+#   - precision <= 53：Python float（double）
+#   - precision > 53：decimal.Decimal，按位数换算十进制有效数字
+# 发现精度不足（溢出/NaN、|b*_k|^2 <= 0、size reduction 不收敛、交换次数异常、
+# 或输出未通过精确整数校验）时，精度翻倍重试；超过上限后回退到整数版 LLL。
+
+FP_ETA = 0.51  # size reduction 阈值（略大于 1/2，容许浮点误差）
+
+
+def _gram_int(B: list[list[int]]) -> list[list[int]]:
+    n = len(B)
+    G = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1):
+            G[i][j] = G[j][i] = _dot_int(B[i], B[j])
+    return G
+
+
+def is_lll_reduced(
+    B_int: list[list[int]], delta: Fraction = Fraction(3, 4), eta: Fraction = Fraction(1, 2)
+) -> bool:
+    """Exact check that the rows of B_int are (delta, eta)-LLL-reduced and independent."""
+    n = len(B_int)
+    if n == 0:
+        return True
+    gs = _int_gram_schmidt(B_int)
+    if gs is None:
+        return False
+    d, lam = gs
+    en, ed = eta.numerator, eta.denominator
+    dp, dq = delta.numerator, delta.denominator
+    for k in range(n):
+        for j in range(k):
+            # |mu_kj| = |lam_kj| / d[j+1] <= eta
+            if ed * abs(lam[k][j]) > en * d[j + 1]:
+                return False
+        if k >= 1:
+            lk = lam[k][k - 1]
+            if dq * (d[k + 1] * d[k - 1] + lk * lk) < dp * d[k] * d[k]:
+                return False
+    return True
+
+
+def _l2_reduce(
+    B_int: list[list[int]],
+    delta: Fraction,
+    precision: int,
+    stop: StopHook | None = None,
+    stats: SolveStats | None = None,
+) -> tuple[list[list[int]], bool] | None:
+    """One floating-point L² run at the given precision (bits).
+
+    Returns (basis, stopped_early), or None on precision failure. Swap and
+    size-reduction counts go to ``stats`` only for successful runs.
+    """
+    B = [[int(x) for x in row] for row in B_int]
+    n = len(B)
+    G = _gram_int(B)
+    max_bits = max((G[i][i].bit_length() for i in range(n)), default=1)
+    max_swaps = n * n * (max_bits + 1) + 100
+    max_passes = 2 * max_bits + 64
+
+    if precision <= 53:
+        conv = float
+        ctx = None
+    else:
+        ctx = decimal.Context(
+            prec=int(precision * 0.30103) + 1, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN
+        )
+        conv = ctx.create_decimal
+    fdelta = conv(delta.numerator) / conv(delta.denominator)
+    eta = conv(FP_ETA) if ctx is None else ctx.create_decimal_from_float(FP_ETA)
+
+    r = [[conv(0)] * n for _ in range(n)]
+    mu = [[conv(0)] * n for _ in range(n)]
+    s = [conv(0)] * (n + 1)
+    reductions = 0
+
+    def cholesky_row(k: int) -> None:
+        # 由 G 的第 k 行计算 r[k][j], mu[k][j] (j<k) 以及 s[j] (j<=k)
+        rk = r[k]
+        mk = mu[k]
+        for j in range(k):
+            acc = conv(G[k][j])
+            mj = mu[j]
+            for i in range(j):
+                acc -= mj[i] * rk[i]
+            rk[j] = acc
+            mk[j] = acc / r[j][j]
+        acc = conv(G[k][k])
+        s[0] = acc
+        for j in range(k):
+            acc -= mk[j] * rk[j]
+            s[j + 1] = acc
+
+    def size_reduce(k: int) -> bool:
+        nonlocal reductions
+        for _ in range(max_passes):
+            cholesky_row(k)
+            if all(abs(mu[k][j]) <= eta for j in range(k)):
+                return True
+            bk = B[k]
+            mk = mu[k]
+            for j in reversed(range(k)):
+                q = round(mk[j])
+                if q == 0:
+                    continue
+                reductions += 1
+                bj = B[j]
+                for c in range(len(bk)):
+                    bk[c] -= q * bj[c]
+                mj = mu[j]
+                for i in range(j):
+                    mk[i] -= q * mj[i]
+            # 精确更新 G 的第 k 行/列
+            for i in range(n):
+                G[k][i] = G[i][k] = _dot_int(bk, B[i])
+        return False
+
+    def swap(k: int) -> None:
+        B[k], B[k - 1] = B[k - 1], B[k]
+        G[k], G[k - 1] = G[k - 1], G[k]
+        for row in G:
+            row[k], row[k - 1] = row[k - 1], row[k]
+
+    try:
+        with decimal.localcontext(ctx) if ctx is not None else nullcontext():
+            r[0][0] = conv(G[0][0])
+            if not r[0][0] > 0:
+                return None
+            k = 1
+            swaps = 0
+            stopped = False
+            while k < n:
+                if not size_reduce(k):
+                    return None
+                rkk = s[k]
+                if not rkk > 0:
+                    return None
+                # Lovász：s[k-1] = |b*_k|^2 + mu^2 |b*_{k-1}|^2 >= delta |b*_{k-1}|^2
+                if s[k - 1] >= fdelta * r[k - 1][k - 1]:
+                    r[k][k] = rkk
+                    k += 1
+                    if stop is not None and stop(B, k):
+                        stopped = True
+                        break
+                else:
+                    swap(k)
+                    swaps += 1
+                    if swaps > max_swaps:
+                        return None
+                    k = max(k - 1, 1)
+                    if k == 1:
+                        r[0][0] = conv(G[0][0])
+    except (OverflowError, ZeroDivisionError, decimal.InvalidOperation):
+        return None
+    if stats is not None:
+        stats.count("lll_swaps", swaps)
+        stats.count("lll_size_reductions", reductions)
+    return B, stopped
+
+
+def lll_reduction_fp(
+    B_int: list[list[int]],
+    delta: Fraction = Fraction(3, 4),
+    precision: int = 53,
+    stop: StopHook | None = None,
+    stats: SolveStats | None = None,
+) -> list[list[int]]:
+    """Floating-point L² LLL with exact integer size reduction and exact fallback.
+
+    Gram–Schmidt coefficients are computed in floating point (double for
+    ``precision <= 53``, ``decimal`` otherwise). On detected precision loss the run is
+    retried with doubled precision; once the precision exceeds the bit size of the
+    Gram matrix, the exact ``lll_reduction_int`` engine is used instead. The output is
+    always certified exactly to be LLL-reduced for ``delta`` (with eta = 0.51), unless
+    ``stop`` ended the run early (the hook itself inspects exact integer rows).
+    ``stats`` receives swap/size-reduction counts and the number of precision retries.
+    """
+    n = len(B_int)
+    if n == 0:
+        return []
+    if _int_gram_schmidt(B_int) is None:
+        # 线性相关输入：浮点 Cholesky 不适用；钩子的检查交给整数版
+        return lll_reduction_int(B_int, delta, stop, stats=stats)
+    max_bits = max(_dot_int(row, row).bit_length() for row in B_int)
+    eta = Fraction(51, 100)
+    prec = max(precision, 2)
+    while prec <= 2 * max_bits + 64:
+        out = _l2_reduce(B_int, delta, prec, stop, stats)
+        if out is not None:
+            B, stopped = out
+            if stopped or is_lll_reduced(B, delta, eta):
+                return B
+        if stats is not None:
+            stats.count("lll_fp_retries")
+        prec *= 2
+    return lll_reduction_int(B_int, delta, stop, stats=stats)
+
+
+# ----------------- 更强的约化：深插入 LLL 与 BKZ-lite -----------------
+# 临界参数下 δ=3/4 的 LLL 输出可能不够短。与其增大 m（维度与代价约三次方增长），
+# 可以在较小的格上多花一些约化时间：
+#   - 深插入（Schnorr–Euchner）：b_k 可插到任意位置 i<k，只要其在 b*_i 方向上的投影
+#     比 δ·|b*_i|^2 短；depth 限制只尝试 i < depth 或 k - i <= depth 的位置
+#   - BKZ-lite：块大小 β（通常 10–20），在每个块内枚举投影最短向量，插入后再做 LLL
+# 两者都以 LLL-约化基为起点，GS 数据用整数 (d, lam) 精确维护；枚举只在块内使用
+# 归一化的浮点 GS 数据（相对 |b*_j|^2），超出 float 范围的比值截断为 FLOAT_CAP。
+
+FLOAT_CAP = 1e300
+BKZ_BLOCK_SIZE = 10
+BKZ_MAX_TOURS = 8
+
+
+def _ratio(a: int, b: int) -> float:
+    try:
+        return min(a / b, FLOAT_CAP)
+    except OverflowError:
+        return FLOAT_CAP
+
+
+def lll_deep_insertion(
+    B_int: list[list[int]], delta: Fraction = Fraction(99, 100), depth: int | None = None
+) -> list[list[int]]:
+    """LLL with deep insertions (Schnorr–Euchner), exact integer GS data.
+
+    Starts from an ``lll_reduction_fp`` basis. Each b_k is size-reduced and then inserted
+    at the first position i < k where its projection orthogonal to b_0..b_{i-1} is shorter
+    than delta·|b*_i|^2; with ``depth`` only positions i < depth or k - i <= depth are
+    tried. Linearly dependent inputs fall back to ``lll_reduction``.
+    """
+    n = len(B_int)
+    if n == 0:
+        return []
+    B = lll_reduction_fp(B_int, delta)
+    gs = _int_gram_schmidt(B)
+    if gs is None:
+        return lll_reduction(B_int, delta)
+    d, lam = gs
+    k = 1
+    while k < n:
+        for j in reversed(range(k)):
+            _int_size_reduce(B, d, lam, k, j)
+        # C = |π_i(b_k)|^2，按 i 递增逐步扣除 mu_{k,i}^2 |b*_i|^2
+        C = Fraction(_dot_int(B[k], B[k]))
+        insert_at = -1
+        for i in range(k):
+            Bi = Fraction(d[i + 1], d[i])
+            allowed = depth is None or i < depth or k - i <= depth
+            if allowed and C < delta * Bi:
+                insert_at = i
+                break
+            C -= Fraction(lam[k][i] * lam[k][i], d[i + 1] * d[i])
+        if insert_at < 0:
+            k += 1
+            continue
+        B.insert(insert_at, B.pop(k))
+        gs = _int_gram_schmidt(B)
+        if gs is None:  # 插入是行的置换，不会产生相关性
+            raise AssertionError("deep insertion produced a dependent basis")
+        d, lam = gs
+        k = max(insert_at, 1)
+    return B
+
+
+def _enum_block(mu: list[list[float]], r: list[float], radius2: float) -> list[int] | None:
+    """Schnorr–Euchner enumeration: shortest nonzero x with sum-of-levels < radius2.
+
+    mu[i][k] (i > k) and r[k] are the block's GS coefficients and squared norms. Returns
+    the coefficient vector (w.r.t. the block rows) or None if nothing beats radius2.
+    """
+    n = len(r)
+    x = [0] * n
+    x[0] = 1
+    centre = [0.0] * n
+    base = [0] * n
+    sign = [1] * n
+    step = [0] * n
+    partial = [0.0] * (n + 1)
+    best: list[int] | None = None
+    last_nonzero = 0
+    k = 0
+    while True:
+        diff = x[k] - centre[k]
+        partial[k] = partial[k + 1] + diff * diff * r[k]
+        if partial[k] < radius2:
+            if k == 0:
+                radius2 = partial[0]
+                best = list(x)
+            else:
+                k -= 1
+                c = -sum(x[i] * mu[i][k] for i in range(k + 1, n))
+                centre[k] = c
+                base[k] = x[k] = round(c)
+                sign[k] = 1 if c >= x[k] else -1
+                step[k] = 0
+                continue
+        else:
+            k += 1
+            if k == n:
+                return best
+        # 同一层的下一个候选：高层全为 0 时只取正值（去掉 ±x 对称），否则围绕中心之字形
+        if k >= last_nonzero:
+            last_nonzero = k
+            x[k] += 1
+        else:
+            step[k] += 1
+            off = (step[k] + 1) // 2
+            x[k] = base[k] + (off * sign[k] if step[k] & 1 else -off * sign[k])
+
+
+def _insert_combination(B: list[list[int]], j: int, u: list[int]) -> None:
+    """Make sum u_i·B[j+i] the row at position j by a unimodular transform of the block."""
+    u = list(u)
+    rows = B[j : j + len(u)]
+    while True:
+        nz = [i for i, ui in enumerate(u) if ui]
+        if len(nz) == 1:
+            break
+        # 欧几里得步：u_a -= q·u_b，row_b += q·row_a，保持 sum u_i·row_i 不变
+        nz.sort(key=lambda i: abs(u[i]))
+        b, a = nz[0], nz[-1]
+        q = u[a] // u[b]
+        u[a] -= q * u[b]
+        ra, rb = rows[a], rows[b]
+        rows[b] = [rb[t] + q * ra[t] for t in range(len(ra))]
+    (i,) = nz
+    v = rows.pop(i)
+    if u[i] < 0:
+        v = [-x for x in v]
+    B[j : j + len(u)] = [v, *rows]
+
+
+def bkz_reduction(
+    B_int: list[list[int]],
+    delta: Fraction = Fraction(99, 100),
+    block_size: int = BKZ_BLOCK_SIZE,
+    max_tours: int = BKZ_MAX_TOURS,
+) -> list[list[int]]:
+    """BKZ-lite: LLL plus Schnorr–Euchner enumeration in blocks of ``block_size``.
+
+    For j = 0..n-2 the block b_j..b_{j+β-1} is enumerated (projected orthogonally to
+    b_0..b_{j-1}); a vector shorter than delta·|b*_j|^2 is moved to position j and the
+    basis is LLL-reduced again. Stops after a full tour without changes or ``max_tours``
+    tours. Linearly dependent inputs fall back to ``lll_reduction``.
+
+    Raises:
+      ValueError: if block_size < 2
+    """
+    if block_size < 2:
+        raise ValueError("block_size must be >= 2")
+    n = len(B_int)
+    if n == 0:
+        return []
+    if _int_gram_schmidt(B_int) is None:
+        return lll_reduction(B_int, delta)
+    B = lll_reduction_fp(B_int, delta)
+    for _tour in range(max_tours):
+        changed = False
+        for j in range(n - 1):
+            k = min(j + block_size, n)
+            gs = _int_gram_schmidt(B)
+            if gs is None:
+                raise AssertionError("BKZ produced a dependent basis")
+            d, lam = gs
+            # 块内 GS 数据，|b*_i|^2 以 |b*_j|^2 归一化
+            r = [max(_ratio(d[i + 1] * d[j], d[i] * d[j + 1]), 1e-300) for i in range(j, k)]
+            mu = [[_ratio(lam[i][t], d[t + 1]) for t in range(j, k)] for i in range(j, k)]
+            u = _enum_block(mu, r, float(delta))
+            if u is None:
+                continue
+            _insert_combination(B, j, u)
+            B = lll_reduction_fp(B, delta)
+            changed = True
+        if not changed:
+            break
+    return B
+
+
+LLL_BACKENDS = {
+    "int": lll_reduction_int,
+    "fp": lll_reduction_fp,
+    "fraction": lll_reduction,
+    "deep": lll_deep_insertion,
+    "bkz": bkz_reduction,
+}
+
+
+# 支持 stop 钩子（提前终止）的后端
+EARLY_STOP_BACKENDS = {"int", "fp"}
+# 会向 stats 报告交换与 size reduction 次数的后端（其余后端只计入阶段耗时）
+COUNTING_BACKENDS = {"int", "fp"}
+
+
+def howgrave_graham_bound2(N: int, m: int, n: int, beta: float = 1.0) -> int:
+    """Return an integer B2 such that |h|^2 < B2 implies |h| < N^{beta·m} / sqrt(n).
+
+    n is the lattice dimension (the number of monomials for bivariate lattices). For
+    beta = 1 the bound is exact; otherwise it is rounded down to a power of two (at
+    most two bits conservative), which only makes early termination later.
+    """
+    if beta >= 1:
+        return (N ** (2 * m) - 1) // n + 1
+    e = int(2 * beta * m * log2(N) - log2(n)) - 1
+    return 1 << max(e, 0)
+
+
+def stop_when_short(bound2: int, count: int = 1) -> StopHook:
+    """Stop hook: the first ``count`` rows are in the reduced prefix with |b_i|^2 < bound2.
+
+    For Coppersmith lattices bound2 is the Howgrave-Graham bound (N^m)^2 / n: any such
+    row is a polynomial vanishing at the small root over Z, so reducing further is wasted
+    work. Only ``count`` exact dot products are spent per call.
+    """
+
+    def hook(B: list[list[int]], k: int) -> bool:
+        if k < count:
+            return False
+        return all(_dot_int(B[i], B[i]) < bound2 for i in range(count))
+
+    return hook
+
+
+def reduce_basis(
+    B_int: list[list[int]],
+    backend: str = "int",
+    delta: Fraction | None = None,
+    stop: StopHook | None = None,
+    stats: SolveStats | None = None,
+) -> list[list[int]]:
+    """Reduce B_int with the named backend.
+
+    "int", "fp" and "fraction" are LLL engines; "deep" (LLL with deep insertions) and
+    "bkz" (BKZ-lite, block size ``BKZ_BLOCK_SIZE``) give shorter vectors at higher cost.
+    delta defaults to each backend's own default (3/4 for LLL, 99/100 for deep/bkz).
+    ``stop`` is an early-termination hook (see ``stop_when_short``); backends outside
+    ``EARLY_STOP_BACKENDS`` ignore it and reduce fully, which is always valid.
+    ``stats`` collects LLL counters from the ``COUNTING_BACKENDS``.
+
+    Raises:
+      ValueError: if backend is unknown
+    """
+    try:
+        fn = LLL_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"unknown LLL backend: {backend!r}") from None
+    kwargs: dict[str, Any] = {}
+    if stop is not None and backend in EARLY_STOP_BACKENDS:
+        kwargs["stop"] = stop
+    if stats is not None and backend in COUNTING_BACKENDS:
+        kwargs["stats"] = stats
+    if delta is None:
+        return fn(B_int, **kwargs)
+    return fn(B_int, delta, **kwargs)
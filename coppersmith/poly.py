@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from math import gcd, isqrt
+
 # 多项式用 dict[int, int] 存储：{幂次: 系数}，系数为 int，自动规范化（去零）
 
 Poly = dict[int, int]
@@ -60,14 +62,17 @@ def sub(a: Poly, b: Poly) -> Poly:
 
 
 def mul(a: Poly, b: Poly) -> Poly:
-    """Return a * b (convolution)."""
+    """Return a * b (convolution).
+
+    Dense enough inputs are multiplied through ``mul_dense`` (Karatsuba/Kronecker).
+    """
+    if min(len(a), len(b)) >= KARATSUBA_THRESHOLD and _is_dense(a) and _is_dense(b):
+        return from_coeffs(mul_dense(to_coeffs(a), to_coeffs(b)))
     out: Poly = {}
     for i, ai in a.items():
         for j, bj in b.items():
             out[i + j] = out.get(i + j, 0) + ai * bj
-            if out[i + j] == 0:
-                del out[i + j]
-    return out
+    return normalize(out)
 
 
 def mul_xk(a: Poly, k: int) -> Poly:
@@ -105,8 +110,9 @@ def pow_poly(a: Poly, e: int) -> Poly:
     while ee > 0:
         if ee & 1:
             out = mul(out, base)
-        base = mul(base, base)
         ee >>= 1
+        if ee:
+            base = mul(base, base)
     return out
 
 
@@ -136,3 +142,399 @@ def mod_poly(a: Poly, m: int) -> Poly:
         if r:
             out[i] = r
     return out
+
+
+def taylor_shift(a: Poly, c: int) -> Poly:
+    """Return a(x + c).
+
+    Repeated synthetic division (Horner): O(d^2) additions and multiplications by c,
+    no binomial coefficients or powers of c.
+    """
+    if not a or c == 0:
+        return dict(a)
+    coeffs = to_coeffs(a)
+    n = len(coeffs)
+    for k in range(n - 1):
+        for j in range(n - 2, k - 1, -1):
+            coeffs[j] += c * coeffs[j + 1]
+    return from_coeffs(coeffs)
+
+
+# ----------------- 整数根求解（替代区间穷举） -----------------
+# 思路：取平方自由部分 g，选小素数 p 使 g mod p 仍平方自由，
+# 在 F_p 中穷举根，再用 Newton/Hensel 提升到模 p^e > 2·bound，最后精确验证。
+# 代价只与 deg 和 log(bound) 有关，与 bound 本身无关。
+
+
+def derivative(a: Poly) -> Poly:
+    """Return the formal derivative a'."""
+    return {i - 1: i * ai for i, ai in a.items() if i > 0}
+
+
+def content(a: Poly) -> int:
+    """Return the gcd of the coefficients (0 for the zero polynomial)."""
+    g = 0
+    for v in a.values():
+        g = gcd(g, v)
+    return g
+
+
+def primitive_part(a: Poly) -> Poly:
+    """Return a / content(a), normalized to a positive leading coefficient."""
+    if not a:
+        return {}
+    g = content(a)
+    if a[degree(a)] < 0:
+        g = -g
+    return {i: ai // g for i, ai in a.items()}
+
+
+def pseudo_rem(a: Poly, b: Poly) -> Poly:
+    """Return prem(a, b) = lc(b)^(deg a - deg b + 1) * a mod b.
+
+    Raises:
+      ValueError: if b is zero
+    """
+    db = degree(b)
+    if db < 0:
+        raise ValueError("division by zero polynomial")
+    lb = b[db]
+    r = dict(a)
+    e = degree(a) - db + 1
+    while r and degree(r) >= db:
+        dr = degree(r)
+        lr = r[dr]
+        r = sub(scale(r, lb), mul_xk(scale(b, lr), dr - db))
+        e -= 1
+    if e > 0:
+        r = scale(r, lb**e)
+    return r
+
+
+def gcd_poly(a: Poly, b: Poly) -> Poly:
+    """Return the primitive gcd of a and b in Z[x] (positive leading coefficient)."""
+    a = primitive_part(a)
+    b = primitive_part(b)
+    if degree(a) < degree(b):
+        a, b = b, a
+    while b:
+        a, b = b, primitive_part(pseudo_rem(a, b))
+    return primitive_part(a)
+
+
+def div_exact(a: Poly, b: Poly) -> Poly:
+    """Return a / b for b dividing a exactly in Z[x].
+
+    Raises:
+      ValueError: if b is zero or the division is not exact
+    """
+    db = degree(b)
+    if db < 0:
+        raise ValueError("division by zero polynomial")
+    lb = b[db]
+    r = dict(a)
+    q: Poly = {}
+    while r and degree(r) >= db:
+        dr = degree(r)
+        c, rem = divmod(r[dr], lb)
+        if rem:
+            raise ValueError("inexact polynomial division")
+        q[dr - db] = c
+        r = sub(r, mul_xk(scale(b, c), dr - db))
+    if r:
+        raise ValueError("inexact polynomial division")
+    return q
+
+
+def _eval_dense_mod(c: list[int], x: int, p: int) -> int:
+    acc = 0
+    for ci in reversed(c):
+        acc = (acc * x + ci) % p
+    return acc
+
+
+def _gcd_dense_mod(a: list[int], b: list[int], p: int) -> list[int]:
+    # F_p[x] 上的欧几里得算法，输入/输出为升幂列表（已去尾零）
+    def trim(c: list[int]) -> list[int]:
+        c = [v % p for v in c]
+        while c and c[-1] == 0:
+            c.pop()
+        return c
+
+    a = trim(a)
+    b = trim(b)
+    while b:
+        inv = pow(b[-1], -1, p)
+        while len(a) >= len(b):
+            f = a[-1] * inv % p
+            off = len(a) - len(b)
+            for i, bi in enumerate(b):
+                a[off + i] = (a[off + i] - f * bi) % p
+            a = trim(a)
+        a, b = b, a
+    return a
+
+
+def _small_primes(limit: int) -> list[int]:
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i * i :: i] = bytearray(len(sieve[i * i :: i]))
+    return [i for i in range(limit + 1) if sieve[i]]
+
+
+def root_bound(a: Poly) -> int:
+    """Return an integer B with |r| <= B for every integer root r != 0 of a."""
+    a = normalize(a)
+    if not a:
+        raise ValueError("zero polynomial has no root bound")
+    low = min(a)
+    lead = abs(a[degree(a)])
+    # 非零整数根整除最低非零项系数；同时受 Cauchy 界约束
+    cauchy = 1 + max((abs(v) for i, v in a.items() if i != degree(a)), default=0) // lead
+    return min(abs(a[low]), cauchy)
+
+
+def integer_roots(a: Poly, bound: int | None = None) -> list[int]:
+    """Return the sorted distinct integer roots r of a with |r| <= bound.
+
+    Runs in time polynomial in deg(a) and log(bound) (Hensel lifting), not in bound.
+
+    Raises:
+      ValueError: if a is the zero polynomial
+    """
+    a = normalize(a)
+    if not a:
+        raise ValueError("zero polynomial has infinitely many roots")
+    roots: set[int] = set()
+    low = min(a)
+    if low > 0:
+        roots.add(0)
+        a = {i - low: ai for i, ai in a.items()}
+    if degree(a) <= 0:
+        return sorted(r for r in roots if bound is None or abs(r) <= bound)
+    B = root_bound(a)
+    if bound is not None:
+        B = min(B, bound)
+    if B <= 0:
+        return sorted(roots)
+
+    g = primitive_part(a)
+    gp = derivative(g)
+    h = gcd_poly(g, gp)
+    if degree(h) > 0:
+        g = div_exact(g, h)
+        gp = derivative(g)
+    d = degree(g)
+    gc = to_coeffs(g)
+    gpc = to_coeffs(gp) if gp else [0]
+    lead = gc[-1]
+
+    limit = 64
+    while True:
+        for p in _small_primes(limit):
+            if p <= d or lead % p == 0:
+                continue
+            if len(_gcd_dense_mod(gc, gpc, p)) > 1:
+                continue  # g mod p 不是平方自由
+            # 在 F_p 中求根并 Hensel 提升到模 M > 2B
+            for r0 in range(p):
+                if _eval_dense_mod(gc, r0, p):
+                    continue
+                r = r0
+                M = p
+                while M <= 2 * B:
+                    M = M * M
+                    fr = _eval_dense_mod(gc, r, M)
+                    dfr = _eval_dense_mod(gpc, r, M)
+                    r = (r - fr * pow(dfr, -1, M)) % M
+                if r > M // 2:
+                    r -= M
+                if abs(r) <= B and eval_at(g, r) == 0:
+                    roots.add(r)
+            return sorted(roots)
+        limit *= 4
+
+
+# ----------------- 稠密多项式：schoolbook / Karatsuba / Kronecker 乘法 -----------------
+# 稠密表示为升幂系数列表 list[int]。大输入走 Kronecker 代换：把系数打包进一个大整数
+# （每槽 k 位，k 大于乘积系数的位长），用 CPython 的次二次大整数乘法一次乘完再拆包。
+# 有符号系数拆成正负两部分打包，只需 3 次大整数乘法：
+#   P+ = A+B+ + A-B-，  P- = (A+ + A-)(B+ + B-) - P+，  AB = P+ - P-
+
+KARATSUBA_THRESHOLD = 16
+# 实测（CPython 3.11）：Kronecker 只在系数较小、项数较多时占优；大系数时 Karatsuba 更快
+KRONECKER_MIN_LEN = 32
+KRONECKER_MAX_BITS = 128
+
+
+def _is_dense(p: Poly) -> bool:
+    return 2 * len(p) > degree(p) + 1
+
+
+def _trim_dense(c: list[int]) -> list[int]:
+    while len(c) > 1 and c[-1] == 0:
+        c.pop()
+    return c
+
+
+def mul_schoolbook(a: list[int], b: list[int]) -> list[int]:
+    """Return a * b for dense coefficient lists by the O(n·m) double loop."""
+    if not a or not b:
+        return [0]
+    out = [0] * (len(a) + len(b) - 1)
+    for i, ai in enumerate(a):
+        if ai:
+            for j, bj in enumerate(b):
+                out[i + j] += ai * bj
+    return out
+
+
+def _add_dense(a: list[int], b: list[int]) -> list[int]:
+    if len(a) < len(b):
+        a, b = b, a
+    out = list(a)
+    for i, bi in enumerate(b):
+        out[i] += bi
+    return out
+
+
+def _sub_dense(a: list[int], b: list[int]) -> list[int]:
+    out = list(a) + [0] * max(0, len(b) - len(a))
+    for i, bi in enumerate(b):
+        out[i] -= bi
+    return out
+
+
+def mul_karatsuba(a: list[int], b: list[int]) -> list[int]:
+    """Return a * b for dense coefficient lists by Karatsuba (schoolbook below threshold)."""
+    if len(a) < KARATSUBA_THRESHOLD or len(b) < KARATSUBA_THRESHOLD:
+        return mul_schoolbook(a, b)
+    h = max(len(a), len(b)) // 2
+    a0, a1 = a[:h], a[h:] or [0]
+    b0, b1 = b[:h], b[h:] or [0]
+    z0 = mul_karatsuba(a0, b0)
+    z2 = mul_karatsuba(a1, b1)
+    z1 = _sub_dense(_sub_dense(mul_karatsuba(_add_dense(a0, a1), _add_dense(b0, b1)), z0), z2)
+    out = [0] * (len(a) + len(b) - 1)
+    for i, v in enumerate(z0):
+        out[i] += v
+    for i, v in enumerate(z1):
+        if v:
+            out[i + h] += v
+    for i, v in enumerate(z2):
+        if v:
+            out[i + 2 * h] += v
+    return out
+
+
+def _kron_pack(c: list[int], nbytes: int) -> int:
+    return int.from_bytes(b"".join(v.to_bytes(nbytes, "little") for v in c), "little")
+
+
+def _kron_unpack(v: int, nbytes: int, n: int) -> list[int]:
+    raw = v.to_bytes(nbytes * n, "little")
+    return [int.from_bytes(raw[i * nbytes : (i + 1) * nbytes], "little") for i in range(n)]
+
+
+def mul_kronecker(a: list[int], b: list[int]) -> list[int]:
+    """Return a * b for dense coefficient lists via Kronecker substitution."""
+    if not a or not b:
+        return [0]
+    n = len(a) + len(b) - 1
+    ma = max(abs(v) for v in a)
+    mb = max(abs(v) for v in b)
+    if ma == 0 or mb == 0:
+        return [0] * n
+    # 每个乘积系数（正、负部分分别）不超过 min(len)·max|a|·max|b|
+    bound = min(len(a), len(b)) * ma * mb
+    nbytes = bound.bit_length() // 8 + 1
+    ap = _kron_pack([v if v > 0 else 0 for v in a], nbytes)
+    an = _kron_pack([-v if v < 0 else 0 for v in a], nbytes)
+    bp = _kron_pack([v if v > 0 else 0 for v in b], nbytes)
+    bn = _kron_pack([-v if v < 0 else 0 for v in b], nbytes)
+    pos = ap * bp + an * bn
+    neg = (ap + an) * (bp + bn) - pos
+    cp = _kron_unpack(pos, nbytes, n)
+    cn = _kron_unpack(neg, nbytes, n)
+    return [cp[i] - cn[i] for i in range(n)]
+
+
+def mul_dense(a: list[int], b: list[int]) -> list[int]:
+    """Return a * b for dense coefficient lists, picking the algorithm by size."""
+    n = min(len(a), len(b))
+    if n < KARATSUBA_THRESHOLD:
+        return mul_schoolbook(a, b)
+    if n >= KRONECKER_MIN_LEN:
+        bits = max(max(abs(v) for v in a).bit_length(), max(abs(v) for v in b).bit_length())
+        if bits <= KRONECKER_MAX_BITS:
+            return mul_kronecker(a, b)
+    return mul_karatsuba(a, b)
+
+
+class DensePoly:
+    """Dense integer polynomial backed by an ascending coefficient list.
+
+    Arithmetic dispatches to ``mul_dense``; ``from_dict``/``to_dict`` convert to and
+    from the dict representation used by the rest of the package.
+    """
+
+    __slots__ = ("coeffs",)
+
+    def __init__(self, coeffs: list[int] | None = None) -> None:
+        self.coeffs = _trim_dense([int(c) for c in coeffs] if coeffs else [0])
+
+    @classmethod
+    def from_dict(cls, p: Poly) -> DensePoly:
+        return cls(to_coeffs(p))
+
+    def to_dict(self) -> Poly:
+        return from_coeffs(self.coeffs)
+
+    def degree(self) -> int:
+        return -1 if self.coeffs == [0] else len(self.coeffs) - 1
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, DensePoly) and self.coeffs == other.coeffs
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.coeffs))
+
+    def __repr__(self) -> str:
+        return f"DensePoly({self.coeffs!r})"
+
+    def __add__(self, other: DensePoly) -> DensePoly:
+        return DensePoly(_add_dense(self.coeffs, other.coeffs))
+
+    def __sub__(self, other: DensePoly) -> DensePoly:
+        return DensePoly(_sub_dense(self.coeffs, other.coeffs))
+
+    def __neg__(self) -> DensePoly:
+        return DensePoly([-c for c in self.coeffs])
+
+    def __mul__(self, other: DensePoly | int) -> DensePoly:
+        if isinstance(other, int):
+            return DensePoly([c * other for c in self.coeffs])
+        return DensePoly(mul_dense(self.coeffs, other.coeffs))
+
+    __rmul__ = __mul__
+
+    def __pow__(self, e: int) -> DensePoly:
+        if e < 0:
+            raise ValueError("exponent must be >= 0")
+        out = DensePoly([1])
+        base = self
+        while e > 0:
+            if e & 1:
+                out = out * base
+            e >>= 1
+            if e:
+                base = base * base
+        return out
+
+    def __call__(self, x: int) -> int:
+        acc = 0
+        for c in reversed(self.coeffs):
+            acc = acc * x + c
+        return acc
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+
+# 可选的求解过程统计：各阶段墙钟时间、LLL 交换/size reduction 次数、大整数位长、采样数。
+# 调用方传入一个 SolveStats，求解器在其中累加；不传（None）时各处只多一次 `is None` 判断。
+# 阶段名：construct（建格）、reduce（格约化）、resultant（消元，仅二元）、extract（求根与验证）
+# 计数：attempts（约化的格数）、lattice_rows（各格维度之和）、windows（分段数）、
+#   lll_swaps、lll_size_reductions、lll_fp_retries（仅 int/fp 后端）、
+#   resultant_samples、resultant_primes、x_candidates、x_scan_fallback（仅二元）
+# 位长（取最大值）：N、lattice_in、lattice_out、resultant
+
+
+@dataclass
+class SolveStats:
+    """Counters filled in by the solvers when passed as ``stats=``.
+
+    Attributes:
+      seconds: wall time per stage (accumulated over calls)
+      calls: number of times each stage ran
+      counts: event counters (swaps, size reductions, samples, ...)
+      bits: largest bit size seen per quantity (modulus, lattice entries, resultant)
+    """
+
+    seconds: dict[str, float] = field(default_factory=dict)
+    calls: dict[str, int] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+    bits: dict[str, int] = field(default_factory=dict)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage ``name``."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t0
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def max_bits(self, name: str, value: int) -> None:
+        """Record the bit size of |value| if it is the largest seen for ``name``."""
+        b = abs(value).bit_length()
+        if b > self.bits.get(name, -1):
+            self.bits[name] = b
+
+    def max_bits_matrix(self, name: str, rows: list[list[int]]) -> None:
+        self.max_bits(name, max((abs(v) for row in rows for v in row), default=0))
+
+    def merge(self, other: SolveStats) -> None:
+        """Add the counters of ``other`` (e.g. from a worker process) into this object."""
+        for k, v in other.seconds.items():
+            self.seconds[k] = self.seconds.get(k, 0.0) + v
+        for k, v in other.calls.items():
+            self.calls[k] = self.calls.get(k, 0) + v
+        for k, v in other.counts.items():
+            self.count(k, v)
+        for k, v in other.bits.items():
+            self.bits[k] = max(self.bits.get(k, v), v)
+
+    def to_dict(self) -> dict[str, dict]:
+        return asdict(self)
+
+    def to_json(self, indent: int | None = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent, sort_keys=True)
+
+
+def stage(stats: SolveStats | None, name: str) -> AbstractContextManager[None]:
+    """``stats.stage(name)``, or a no-op context when instrumentation is off."""
+    return nullcontext() if stats is None else stats.stage(name)
@@ -1,9 +1,39 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from fractions import Fraction
+from functools import lru_cache
+from math import comb, gcd, log2
+from operator import mul as _mul
+from typing import Any
 
-from .lll import lll_reduction
-from .poly import Poly, degree, from_coeffs, mul_xk, pow_poly, scale
+from .lll import howgrave_graham_bound2, reduce_basis, stop_when_short
+from .poly import (
+    Poly,
+    degree,
+    eval_at,
+    from_coeffs,
+    gcd_poly,
+    integer_roots,
+    mul,
+    mul_xk,
+    normalize,
+    scale,
+    taylor_shift,
+)
+from .stats import SolveStats, stage
+
+# 根提取时最多考察的短向量条数；gcd 策略最多合并其中最短的 GCD_ROWS 条
+EXTRACT_ROWS = 12
+GCD_ROWS = 4
+# construct_lattice 的 LRU 缓存容量（同一模数反复求解时复用格基）
+LATTICE_CACHE_SIZE = 32
+# LLL 实际输出的根 Hermite 因子约 1.02（Gama–Nguyen 实测），远好于最坏情形 2^{1/4}
+LLL_LOG2_HERMITE = log2(1.02)
+# 自动选参时考察的最大 m
+AUTO_MAX_M = 8
 
 # 教学版：单变量 Coppersmith 小根方法（基础版，Howgrave-Graham 变体）
 # 输入：
@@ -13,6 +43,8 @@ from .poly import Poly, degree, from_coeffs, mul_xk, pow_poly, scale
 # - m, t: 构造格的参数（常见取 m≈deg(f)，t≈deg(f) 或更小）
 # 输出：
 # - 候选整数根列表（去重），每个 r 满足 |r|<X 且 f(r)≡0 (mod N)
+# 未知因子模式（beta<1，Howgrave-Graham / May）：求 f(r)≡0 (mod b)，b|N 未知且 b≥N^beta；
+# 格构造不变，只是 Howgrave-Graham 目标界变为 b^m/√n，根的验证改为 gcd(f(r), N)≥N^beta
 
 
 def construct_lattice(
@@ -23,31 +55,158 @@ def construct_lattice(
     - 对 i = 0..t-1:              x^i * f(x)^m
     然后进行列缩放：列 k 乘以 X^k，相当于对变量替换 x -> X·x
     返回：整数矩阵 B 以及列数 ncols
+    结果按 (f, N, X, m, t) 做 LRU 缓存；每次返回新的列表副本，调用方可随意修改。
     """
-    f = from_coeffs(f_coeffs)
+    rows, ncols = _build_lattice(tuple(f_coeffs), N, X, m, t)
+    return [list(row) for row in rows], ncols
+
+
+@lru_cache(maxsize=LATTICE_CACHE_SIZE)
+def _power_table(base: int, n: int) -> tuple[int, ...]:
+    # base^0..base^{n-1}；同一 (N, X) 的多次构造（含批量接口）共用
+    pows = [1] * n
+    for k in range(1, n):
+        pows[k] = pows[k - 1] * base
+    return tuple(pows)
+
+
+@lru_cache(maxsize=LATTICE_CACHE_SIZE)
+def _build_lattice(
+    f_key: tuple[int, ...], N: int, X: int, m: int, t: int
+) -> tuple[tuple[tuple[int, ...], ...], int]:
+    f = from_coeffs(list(f_key))
     d = degree(f)
 
+    # 幂次阶梯：f^{i+1} = f^i · f，N 的幂一次性建表
+    N_pows = _power_table(N, m + 1)
+
+    fis: list[Poly] = [{0: 1}]
+    for _ in range(m):
+        fis.append(mul(fis[-1], f))
+    return _lattice_from_powers(fis, d, N_pows, X, m, t)
+
+
+def _lattice_from_powers(
+    fis: list[Poly], d: int, N_pows: tuple[int, ...], X: int, m: int, t: int
+) -> tuple[tuple[tuple[int, ...], ...], int]:
+    # fis[i] = f^i (i = 0..m)
     polys: list[Poly] = []
     # i = 0..m-1 层
     for i in range(m):
-        fi = pow_poly(f, i)
-        scale_N = pow(N, m - i)
-        fi_scaled = scale(fi, scale_N)
+        fi_scaled = scale(fis[i], N_pows[m - i])
         polys.extend(mul_xk(fi_scaled, j) for j in range(d))
     # f(x)^m 的 t 个移位
-    f_m = pow_poly(f, m)
-    polys.extend(mul_xk(f_m, i) for i in range(t))
+    polys.extend(mul_xk(fis[m], i) for i in range(t))
 
-    # 列缩放并转为整数矩阵
+    # 列缩放并转为整数矩阵（X 的幂同样建表）
     max_deg = max((degree(p) for p in polys), default=0)
     ncols = max_deg + 1
-    B: list[list[int]] = []
+    X_pows = _power_table(X, ncols)
+    B: list[tuple[int, ...]] = []
     for p in polys:
         row = [0] * ncols
         for k, ak in p.items():
-            row[k] = ak * pow(X, k)
-        B.append(row)
-    return B, ncols
+            row[k] = ak * X_pows[k]
+        B.append(tuple(row))
+    return tuple(B), ncols
+
+
+@dataclass(frozen=True)
+class LatticePrecheck:
+    """Feasibility estimate for a univariate lattice, computed from its diagonal.
+
+    Attributes:
+      dim: lattice dimension n = m·d + t
+      log2_det: log2 of det(L) (product of the diagonal; the basis is triangular)
+      log2_target: log2 of the Howgrave-Graham bound N^{beta·m} / sqrt(n)
+      log2_b1_estimate: log2 of the typical LLL output 1.02^n · det^{1/n} for ||b_1||
+      log2_b1_worst: log2 of the LLL guarantee 2^{(n-1)/4} · det^{1/n}
+      margin_bits: log2_target - log2_b1_estimate
+      likely: margin_bits > 0 (LLL will typically find a usable first vector)
+      guaranteed: the worst-case LLL bound already satisfies Howgrave-Graham
+    """
+
+    dim: int
+    log2_det: float
+    log2_target: float
+    log2_b1_estimate: float
+    log2_b1_worst: float
+    margin_bits: float
+    likely: bool
+    guaranteed: bool
+
+
+def precheck_univariate(
+    f_coeffs: list[int], N: int, X: int, m: int, t: int, beta: float = 1.0
+) -> LatticePrecheck:
+    """Evaluate the Howgrave-Graham condition for ``construct_lattice`` without building it.
+
+    Row (i, j) has degree i·d + j and leading coefficient N^{m-i}·lc(f)^i, so the
+    basis is lower triangular and
+      log2 det = sum (m-i)·log2 N + i·log2|lc| + (i·d+j)·log2 X.
+    Runs in O(m·d + t) float operations. For roots modulo an unknown divisor
+    b >= N^beta the target is b^m / sqrt(n) >= N^{beta·m} / sqrt(n).
+
+    Raises:
+      ValueError: if N <= 1, X <= 0, m < 1, beta not in (0, 1], or f is constant
+    """
+    if N <= 1:
+        raise ValueError("N must be > 1")
+    if X <= 0:
+        raise ValueError("X must be positive")
+    if m < 1:
+        raise ValueError("m must be >= 1")
+    if not 0 < beta <= 1:
+        raise ValueError("beta must be in (0, 1]")
+    f = from_coeffs(f_coeffs)
+    d = degree(f)
+    if d < 1:
+        raise ValueError("f must have degree >= 1")
+    lN = log2(N)
+    lX = log2(X)
+    llc = log2(abs(f[d]))
+    log2_det = 0.0
+    for i in range(m):
+        for j in range(d):
+            log2_det += (m - i) * lN + i * llc + (i * d + j) * lX
+    for j in range(t):
+        log2_det += m * llc + (m * d + j) * lX
+    n = m * d + t
+    log2_target = beta * m * lN - 0.5 * log2(n)
+    estimate = n * LLL_LOG2_HERMITE + log2_det / n
+    worst = (n - 1) / 4 + log2_det / n
+    margin = log2_target - estimate
+    return LatticePrecheck(
+        n, log2_det, log2_target, estimate, worst, margin, margin > 0, log2_target > worst
+    )
+
+
+def auto_parameters(
+    f_coeffs: list[int], N: int, X: int, beta: float = 1.0, max_m: int = AUTO_MAX_M
+) -> list[tuple[int, int]]:
+    """Return candidate (m, t) pairs in increasing lattice dimension.
+
+    Asymptotically X < N^{beta^2/d - eps} needs m ≈ beta^2/(d·eps); instead of the
+    asymptotic formula, every m <= max_m is checked with ``precheck_univariate`` and the
+    smallest t making it likely is kept. If no pair is likely, the single pair with the
+    best margin is returned so that callers still get one attempt.
+    """
+    d = degree(from_coeffs(f_coeffs))
+    likely: list[tuple[int, int, int]] = []
+    best: tuple[float, int, int] | None = None
+    for m in range(1, max_m + 1):
+        # t 的上限取 May 的推荐值 d·m·(1/beta - 1) 与 d 中较大者
+        t_max = max(d, int(d * m * (1 / beta - 1)) + 1)
+        for t in range(t_max + 1):
+            pc = precheck_univariate(f_coeffs, N, X, m, t, beta)
+            if best is None or pc.margin_bits > best[0]:
+                best = (pc.margin_bits, m, t)
+            if pc.likely:
+                likely.append((pc.dim, m, t))
+                break
+    if likely:
+        return [(m, t) for _dim, m, t in sorted(likely)]
+    return [(best[1], best[2])] if best is not None else []
 
 
 def eval_unscaled_row_at(row: list[int], r: int, X: int) -> Fraction:
@@ -68,39 +227,458 @@ def eval_unscaled_row_at(row: list[int], r: int, X: int) -> Fraction:
     return total
 
 
+def unscale_row(row: list[int], X: int) -> Poly:
+    """Undo the column scaling of a lattice row, returning an integer polynomial.
+
+    Every basis row has column k divisible by X^k, so any integer combination
+    (in particular every LLL output row) unscales exactly.
+    """
+    out: Poly = {}
+    X_pow = 1
+    for k, ck in enumerate(row):
+        if ck:
+            out[k] = ck // X_pow
+        X_pow *= X
+    return out
+
+
+def _is_root(f: Poly, r: int, N: int, beta: float) -> bool:
+    # beta=1：f(r) ≡ 0 (mod N)；beta<1：f(r) 与 N 的公因子 b 满足 b ≥ N^beta
+    v = eval_at(f, r)
+    if beta >= 1:
+        return v % N == 0
+    b = gcd(v, N)
+    return b > 1 and log2(b) >= beta * log2(N)
+
+
+def _extract_roots_rows(hs: list[Poly], f: Poly, N: int, X: int, beta: float = 1.0) -> set[int]:
+    # 逐行求整数根，取并集
+    candidates: set[int] = set()
+    for h in hs:
+        for r in integer_roots(h, X - 1):
+            # 验证 f(r) ≡ 0 (mod N)（或模 N 的未知因子 b ≥ N^beta）
+            if _is_root(f, r, N, beta):
+                candidates.add(r)
+    return candidates
+
+
+def _extract_roots_gcd(hs: list[Poly], f: Poly, N: int, X: int, beta: float = 1.0) -> set[int]:
+    # 真根同时是所有“足够短”向量的根：依次与更长的向量取 gcd，次数降到 0 前停止，
+    # 只对最后的低次 gcd 求根（常见情形为一次式，即一次整除）
+    if not hs:
+        return set()
+    g = hs[0]
+    for h in hs[1:GCD_ROWS]:
+        g2 = gcd_poly(g, h)
+        if degree(g2) < 1:
+            break
+        g = g2
+    return _extract_roots_rows([g], f, N, X, beta)
+
+
+def extract_roots(
+    Bref: list[list[int]],
+    f: Poly,
+    N: int,
+    X: int,
+    strategy: str = "gcd",
+    beta: float = 1.0,
+) -> list[int]:
+    """Recover roots |r|<X of f mod N from the rows of a reduced basis.
+
+    Args:
+      Bref: LLL-reduced lattice basis (scaled by powers of X)
+      f: the polynomial being solved
+      N, X: modulus and root bound
+      strategy: "gcd" (gcd of the shortest rows first, falling back to per-row solving
+        when it yields nothing) or "rows" (solve every row independently)
+      beta: accept r when gcd(f(r), N) >= N^beta instead of f(r) ≡ 0 (mod N) if < 1
+    Raises:
+      ValueError: if strategy is unknown
+    """
+    if strategy not in ("gcd", "rows"):
+        raise ValueError(f"unknown extraction strategy: {strategy!r}")
+    rows = sorted(Bref[: min(len(Bref), EXTRACT_ROWS)], key=lambda r: sum(v * v for v in r))
+    hs = [h for h in (unscale_row(row, X) for row in rows) if h]
+    return _extract_from_polys(hs, f, N, X, strategy, beta)
+
+
+def _extract_from_polys(
+    hs: list[Poly], f: Poly, N: int, X: int, strategy: str, beta: float
+) -> list[int]:
+    if strategy == "gcd":
+        candidates = _extract_roots_gcd(hs, f, N, X, beta)
+        if candidates:
+            return sorted(candidates)
+    return sorted(_extract_roots_rows(hs, f, N, X, beta))
+
+
+def make_monic_mod(f_coeffs: list[int], N: int) -> list[int]:
+    """Return f / lc(f) mod N (coefficients in [0, N)).
+
+    Raises:
+      ValueError: if f is zero or lc(f) is not invertible mod N (the gcd is then a
+        nontrivial factor of N and is included in the message)
+    """
+    f = from_coeffs(f_coeffs)
+    if not f:
+        raise ValueError("f must be nonzero")
+    d = degree(f)
+    lc = f[d] % N
+    g = gcd(lc, N)
+    if g != 1:
+        raise ValueError(f"leading coefficient not invertible mod N (gcd={g})")
+    inv = pow(lc, -1, N)
+    return [f.get(k, 0) * inv % N for k in range(d)] + [1]
+
+
 def find_small_roots_univariate(
-    f_coeffs: list[int], N: int, X: int, m: int = 3, t: int = 3
+    f_coeffs: list[int],
+    N: int,
+    X: int,
+    m: int | str = 3,
+    t: int = 3,
+    backend: str = "int",
+    extraction: str = "gcd",
+    beta: float = 1.0,
+    split: int = 1,
+    max_workers: int | None = 0,
+    early_stop: bool = True,
+    stats: SolveStats | None = None,
 ) -> list[int]:
     """Find small roots |r|<X of f(x) ≡ 0 (mod N) using lattice/LLL.
 
+    With beta < 1 the congruence is taken modulo an unknown divisor b of N with
+    b >= N^beta (Howgrave-Graham / May); f is made monic mod N first and the
+    reachable bound becomes X ≈ N^{beta^2/d}. For known high bits of p,
+    f(x) = p0 + x with beta ≈ 1/2 recovers p from a (m+t)-dimensional lattice.
+
     Args:
       f_coeffs: ascending integer coefficients of f
       N: modulus (>0)
       X: search bound (>0)
-      m,t: lattice parameters
+      m,t: lattice parameters; m="auto" picks (m, t) with ``auto_parameters`` (t is
+        ignored) and escalates to the next candidate only while no root is found
+      backend: LLL backend ("int" exact, "fp" floating-point L², "fraction" reference)
+      extraction: root extraction strategy, see ``extract_roots``
+      beta: divisor exponent in (0, 1]; 1 means the modulus is N itself
+      split: cover (-X, X) with this many sub-intervals centred at c and solve
+        f(x + c) with the smaller bound (see ``split_intervals``)
+      max_workers: process pool size for the sub-intervals (None = ``os.cpu_count()``,
+        0 = solve them in this process)
+      early_stop: stop LLL as soon as the first reduced row meets the Howgrave-Graham
+        bound (see ``howgrave_graham_bound2``); roots found are unchanged
+      stats: optional ``SolveStats`` that accumulates per-stage wall time (construct,
+        reduce, extract), LLL counters and bit sizes over every lattice tried
     Returns:
-      Sorted list of integer roots r with |r|<X and f(r)≡0 (mod N)
+      Sorted list of integer roots r with |r|<X and f(r)≡0 (mod N), or with
+      gcd(f(r), N) >= N^beta when beta < 1
+    Raises:
+      ValueError: if N <= 0, beta is not in (0, 1], split < 1, or (beta < 1) lc(f)
+        is not invertible mod N
     """
     if N <= 0:
         raise ValueError("N must be positive")
     if X <= 0:
         return []
+    if not 0 < beta <= 1:
+        raise ValueError("beta must be in (0, 1]")
+    if split < 1:
+        raise ValueError("split must be >= 1")
     if not f_coeffs:
         return []
+    if beta < 1:
+        if N == 1 or degree(from_coeffs(f_coeffs)) < 1:
+            return []
+        f_coeffs = make_monic_mod(f_coeffs, N)
+
+    if m == "auto":
+        if N == 1 or degree(from_coeffs(f_coeffs)) < 1:
+            return []
+        roots: list[int] = []
+        X_sub = split_intervals(X, split)[0][1] if split > 1 else X
+        for mm, tt in auto_parameters(f_coeffs, N, X_sub, beta):
+            roots = find_small_roots_univariate(
+                f_coeffs,
+                N,
+                X,
+                mm,
+                tt,
+                backend,
+                extraction,
+                beta,
+                split,
+                max_workers,
+                early_stop,
+                stats,
+            )
+            if roots:
+                break
+        return roots
+    if not isinstance(m, int):
+        raise ValueError(f"m must be an int or 'auto', got {m!r}")
+    if split > 1:
+        return _find_split(
+            f_coeffs, N, X, m, t, backend, extraction, beta, split, max_workers, early_stop, stats
+        )
+
+    with stage(stats, "construct"):
+        B, _ = construct_lattice(f_coeffs, N, X, m, t)
+    return _reduce_and_extract(
+        B, from_coeffs(f_coeffs), N, X, m, backend, extraction, beta, early_stop, stats
+    )
+
+
+def _reduce_and_extract(
+    B: list[list[int]],
+    f: Poly,
+    N: int,
+    X: int,
+    m: int,
+    backend: str,
+    extraction: str,
+    beta: float,
+    early_stop: bool,
+    stats: SolveStats | None,
+) -> list[int]:
+    stop = stop_when_short(howgrave_graham_bound2(N, m, len(B), beta)) if early_stop else None
+    if stats is not None:
+        stats.count("attempts")
+        stats.count("lattice_rows", len(B))
+        stats.max_bits("N", N)
+        stats.max_bits_matrix("lattice_in", B)
+    with stage(stats, "reduce"):
+        Bref = reduce_basis(B, backend, stop=stop, stats=stats)
+    # 反缩放为整数多项式后直接在 Z 上求整数根（Hensel 提升），代价为 polylog(X)
+    with stage(stats, "extract"):
+        roots = extract_roots(Bref, f, N, X, extraction, beta)
+    if stats is not None:
+        stats.max_bits_matrix("lattice_out", Bref)
+    return roots
+
+
+# ----------------- 区间划分：X 略超可证界时，把 (-X, X) 切成 k 段分别求解 -----------------
+# 第 j 段以 c_j 为中心、半宽 X_s ≈ X/k：令 g_j(x) = f(x + c_j)，在 |x| < X_s 内求小根。
+# 共享模板：f 的幂 f^i 只算一次，g_j^i = (f^i)(x + c_j) 由 Taylor 平移得到（O((md)^2)，
+# 无需重做多项式乘法）；N、X_s 的幂表共用。各段互相独立，可分发到进程池；
+# 模板经 initializer 下发一次，之后每个任务只传中心 c_j。
+# 代价：k 个格，每个格的 det 中 X 的贡献下降 k^{n(n-1)/2}，维度可保持较小。
+
+
+def split_intervals(X: int, k: int) -> list[tuple[int, int]]:
+    """Return k (centre, half-width) pairs whose open windows cover every |r| < X.
+
+    Window j is {c_j + x : |x| < X_s}; all windows share the same half-width X_s.
+    """
+    width = -(-(2 * X - 1) // k)  # 每段需覆盖的整数个数
+    X_s = width // 2 + 1  # 2·X_s - 1 >= width
+    lo = -X + 1
+    return [(lo + j * width + X_s - 1, X_s) for j in range(k)]
+
+
+_split_state: dict[str, Any] = {}
+
+
+def _init_split_worker(template: tuple) -> None:
+    _split_state["template"] = template
+
+
+def _solve_shifted(c: int) -> tuple[list[int], SolveStats | None]:
+    fis, f_coeffs, d, N, X_s, m, t, backend, extraction, beta, early_stop, instrument = (
+        _split_state["template"]
+    )
+    # 统计在各工作进程内单独收集，随结果带回父进程合并
+    stats = SolveStats() if instrument else None
+    with stage(stats, "construct"):
+        shifted = [taylor_shift(fi, c) for fi in fis]
+        rows, _ = _lattice_from_powers(shifted, d, _power_table(N, m + 1), X_s, m, t)
+    g = taylor_shift(from_coeffs(list(f_coeffs)), c)
+    B = [list(row) for row in rows]
+    roots = _reduce_and_extract(B, g, N, X_s, m, backend, extraction, beta, early_stop, stats)
+    return [x + c for x in roots], stats
+
+
+def _find_split(
+    f_coeffs: list[int],
+    N: int,
+    X: int,
+    m: int,
+    t: int,
+    backend: str,
+    extraction: str,
+    beta: float,
+    split: int,
+    max_workers: int | None,
+    early_stop: bool,
+    stats: SolveStats | None,
+) -> list[int]:
+    f = from_coeffs(f_coeffs)
+    d = degree(f)
+    if d < 1:
+        return []
+    windows = split_intervals(X, split)
+    X_s = windows[0][1]
+    with stage(stats, "construct"):
+        fis: list[Poly] = [{0: 1}]
+        for _ in range(m):
+            fis.append(mul(fis[-1], f))
+    instrument = stats is not None
+    template = (
+        fis,
+        tuple(f_coeffs),
+        d,
+        N,
+        X_s,
+        m,
+        t,
+        backend,
+        extraction,
+        beta,
+        early_stop,
+        instrument,
+    )
+    centres = [c for c, _ in windows]
+    if max_workers == 0:
+        _init_split_worker(template)
+        results = [_solve_shifted(c) for c in centres]
+    else:
+        workers = min(max_workers or os.cpu_count() or 1, len(centres))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_split_worker, initargs=(template,)
+        ) as pool:
+            results = list(pool.map(_solve_shifted, centres))
+    if stats is not None:
+        stats.count("windows", len(results))
+        for _roots, sub in results:
+            if sub is not None:
+                stats.merge(sub)
+    return sorted({r for roots, _sub in results for r in roots if abs(r) < X})
+
+
+# ----------------- 批量接口：同一 N、同一结构的多个 f_k -----------------
+# 典型负载：RSA e=3 的 x^3 - c_k，只有常数项不同。摊销方式：
+#   - 骨架：g = f - f(0) 的幂 g^l 只算一次，f_k^i = sum_l C(i,l)·c_k^{i-l}·g^l 只做标量运算；
+#     N、X 的幂表与单个求解共用缓存
+#   - 热启动：上一个实例的约化基 R = U·B 给出幺模变换 U（B 为下三角，回代即可精确求出），
+#     用 U·B_k 作为下一个实例的初始基；同结构的格上 U 基本通用，LLL 交换次数明显减少
+#   - 提取：全部约化结束后统一一遍，反缩放共用 X 的幂表
+
+
+def _basis_transform(B: list[list[int]], R: list[list[int]]) -> list[list[int]] | None:
+    """Return U with U·B = R for a square lower-triangular basis B (None if R is not in L(B))."""
+    n = len(B)
+    U: list[list[int]] = []
+    for row in R:
+        rem = list(row)
+        u = [0] * n
+        for i in reversed(range(n)):
+            if rem[i]:
+                q, r = divmod(rem[i], B[i][i])
+                if r:
+                    return None
+                u[i] = q
+                bi = B[i]
+                for j in range(i + 1):
+                    rem[j] -= q * bi[j]
+        U.append(u)
+    return U
+
+
+def _apply_transform(U: list[list[int]], B: list[list[int]]) -> list[list[int]]:
+    cols = [[row[j] for row in B] for j in range(len(B[0]))]
+    return [[sum(map(_mul, u, col)) for col in cols] for u in U]
+
+
+def find_small_roots_univariate_batch(
+    polys: list[list[int]],
+    N: int,
+    X: int,
+    m: int = 3,
+    t: int = 3,
+    backend: str = "int",
+    extraction: str = "gcd",
+    warm_start: bool = True,
+    early_stop: bool = True,
+) -> list[list[int]]:
+    """Solve f_k(x) ≡ 0 (mod N), |x| < X for many f_k sharing N, X and (m, t).
+
+    The polynomials must share their degree. When they differ only in the constant
+    term the lattices are assembled from one shared set of powers of f - f(0); with
+    ``warm_start`` each LLL run starts from the previous reduced basis mapped onto
+    the new lattice. ``early_stop`` stops each LLL run at the Howgrave-Graham bound,
+    as in ``find_small_roots_univariate``. Extraction runs once over all reduced
+    bases at the end.
+
+    Returns:
+      One sorted root list per input polynomial, in input order
+    Raises:
+      ValueError: if N <= 0, extraction is unknown, the degrees differ, or a
+        polynomial is constant
+    """
+    if N <= 0:
+        raise ValueError("N must be positive")
+    if extraction not in ("gcd", "rows"):
+        raise ValueError(f"unknown extraction strategy: {extraction!r}")
+    if not polys:
+        return []
+    fs = [from_coeffs(c) for c in polys]
+    d = degree(fs[0])
+    if any(degree(f) != d for f in fs):
+        raise ValueError("all polynomials in a batch must share the same degree")
+    if d < 1:
+        raise ValueError("f must have degree >= 1")
+    if X <= 0:
+        return [[] for _ in polys]
+
+    # 非常数部分相同时共用 g^l 骨架
+    g_keys = {tuple(sorted((k, v) for k, v in f.items() if k)) for f in fs}
+    g_pows: list[Poly] | None = None
+    if len(g_keys) == 1:
+        g: Poly = {k: v for k, v in fs[0].items() if k}
+        g_pows = [{0: 1}]
+        for _ in range(m):
+            g_pows.append(mul(g_pows[-1], g))
+    N_pows = _power_table(N, m + 1)
+    # 各格维度相同（d·m + t），提前终止的界只算一次
+    stop = stop_when_short(howgrave_graham_bound2(N, m, d * m + t)) if early_stop else None
+
+    reduced: list[list[list[int]]] = []
+    U: list[list[int]] | None = None
+    for f in fs:
+        if g_pows is not None:
+            c = f.get(0, 0)
+            fis = [
+                _combine([comb(i, ell) * c ** (i - ell) for ell in range(i + 1)], g_pows)
+                for i in range(m + 1)
+            ]
+        else:
+            fis = [{0: 1}]
+            for _ in range(m):
+                fis.append(mul(fis[-1], f))
+        rows, _ = _lattice_from_powers(fis, d, N_pows, X, m, t)
+        B = [list(row) for row in rows]
+        start = _apply_transform(U, B) if warm_start and U is not None else B
+        Bref = reduce_basis(start, backend, stop=stop)
+        if warm_start:
+            U = _basis_transform(B, Bref)
+        reduced.append(Bref)
+
+    X_pows = _power_table(X, len(reduced[0][0]) if reduced[0] else 1)
+    out: list[list[int]] = []
+    for idx, Bref in enumerate(reduced):
+        rows = sorted(Bref[: min(len(Bref), EXTRACT_ROWS)], key=lambda r: sum(v * v for v in r))
+        hs = [
+            h for h in ({k: ck // X_pows[k] for k, ck in enumerate(row) if ck} for row in rows) if h
+        ]
+        out.append(_extract_from_polys(hs, fs[idx], N, X, extraction, 1.0))
+    return out
+
 
-    B, _ = construct_lattice(f_coeffs, N, X, m, t)
-    Bref = lll_reduction(B)
-
-    candidates = set()
-    # 取前若干短向量尝试
-    for row in Bref[: min(len(Bref), 12)]:
-        for r in range(-X + 1, X):
-            val = eval_unscaled_row_at(row, r, X)
-            if val == 0:
-                # 验证 f(r) ≡ 0 (mod N)
-                fr = 0
-                for i, ai in enumerate(f_coeffs):
-                    fr += ai * pow(r, i)
-                if fr % N == 0:
-                    candidates.add(r)
-    return sorted(candidates)
+def _combine(scalars: list[int], basis: list[Poly]) -> Poly:
+    # sum scalars[l] · basis[l]
+    acc: Poly = {}
+    for ell, s in enumerate(scalars):
+        if s:
+            for k, v in basis[ell].items():
+                acc[k] = acc.get(k, 0) + s * v
+    return normalize(acc)
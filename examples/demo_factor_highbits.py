@@ -2,40 +2,24 @@
 from __future__ import annotations
 
 import random
-from math import isqrt
 
-# 因式分解：已知 p 的高位（近似值）
-# 设 p≈p0，|p−p0|<X，令 q0=⌊N/p0⌋，构造 F(x,y)=(p0+x)(q0+y)−N。
-# 若 |x|<X、|y| 也很小，则可用二元 Coppersmith + 结果式消元恢复 (x,y)。
 from coppersmith.bivar import Bivar
 from coppersmith.bivariate import try_find_small_roots_bivar
 
-
-def gen_prime(bits: int) -> int:
-    def is_prime(n: int) -> bool:
-        if n < 2:
-            return False
-        if n % 2 == 0:
-            return n == 2
-        r = isqrt(n)
-        f = 3
-        while f <= r:
-            if n % f == 0:
-                return False
-            f += 2
-        return True
-
-    while True:
-        x = random.getrandbits(bits) | 1
-        if is_prime(x):
-            return x
+# 因式分解：已知 p 的高位（近似值）
+# 设 p≈p0，|p−p0|<X，令 q0=⌊N/p0⌋，构造 F(x,y)=(p0+x)(q0+y)−N。
+# 若 |x|<X、|y| 也很小，则可用二元 Coppersmith + 结果式消元恢复 (x,y)。
+# 更直接的做法：p0+x ≡ 0 (mod p)，p 是 N 的未知因子且 p≥N^beta，
+# 用单变量未知因子模式（beta<1）只需一个 (m+t) 维格，无需结果式。
+from coppersmith.instances import random_prime
+from coppersmith.univariate import find_small_roots_univariate
 
 
 def main() -> None:
     random.seed(131)
     b = 28  # 每个素数位数（示例较小，便于快速演示）
-    p = gen_prime(b)
-    q = gen_prime(b)
+    p = random_prime(b)
+    q = random_prime(b)
     N = p * q
 
     # 已知 p 的高位：取 k (> b/2) 位高位已知，构造 p0 为“保留高 k 位，其余置 0”
@@ -56,6 +40,11 @@ def main() -> None:
         (0, 0): p0 * q0 - N,
     }
 
+    # 单变量未知因子模式：f(x)=p0+x，gcd(f(x0), N)=p；
+    # p 可能是较小的因子（略小于 √N），beta 取略低于 1/2，可达界约 N^{beta^2}
+    xs = find_small_roots_univariate([p0, 1], N=N, X=X, m="auto", beta=0.48)
+    univar_recovers = [(p0 + x, N // (p0 + x)) for x in xs if N % (p0 + x) == 0]
+
     roots = try_find_small_roots_bivar(F, N=N, X=X, Y=Y, m=2, tx=2, ty=2)
 
     recovers = []
@@ -78,12 +67,15 @@ def main() -> None:
             "y_true": y_true,
             "roots_found": roots[:10],
             "recovers": recovers[:3],
+            "univar_roots": xs,
+            "univar_recovers": univar_recovers,
         }
     )
 
     assert any(pp == p and qq == q for (pp, qq) in recovers), (
         "未能恢复 (p,q)；可增大 m,tx,ty 或调整 b,k 再试"
     )
+    assert (p, q) in univar_recovers, "单变量未知因子模式未能恢复 p"
     print("OK: 通过已知高位成功因式分解 N")
 
 
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import random
 
+from coppersmith.instances import random_prime
+
 # Hastad 广播攻击（e=3）：同一消息 m 在不同互素模数 Ni 上加密 ci = m^3 mod Ni
 # 在无填充情况下，若 m^3 < N1*N2*N3，则 CRT 合并得到 C ≡ m^3 (mod N123)
 # 且 0 ≤ C < N123，于是 m = ⌊C^{1/3}⌉。这里完整实现：手写 CRT 与整数立方根。
@@ -55,30 +57,9 @@ def main() -> None:
     e = 3
 
     # 生成三个互素模数（小规模演示）
-    def gen_prime(bits: int) -> int:
-        from math import isqrt
-
-        def is_prime(n: int) -> bool:
-            if n < 2:
-                return False
-            if n % 2 == 0:
-                return n == 2
-            r = isqrt(n)
-            f = 3
-            while f <= r:
-                if n % f == 0:
-                    return False
-                f += 2
-            return True
-
-        while True:
-            x = random.getrandbits(bits) | 1
-            if is_prime(x):
-                return x
-
-    N1 = gen_prime(20) * gen_prime(20)
-    N2 = gen_prime(20) * gen_prime(20)
-    N3 = gen_prime(20) * gen_prime(20)
+    N1 = random_prime(20) * random_prime(20)
+    N2 = random_prime(20) * random_prime(20)
+    N3 = random_prime(20) * random_prime(20)
 
     # 选择小消息 m，使 m^3 < N1*N2*N3
     Mprod = N1 * N2 * N3
@@ -5,34 +5,14 @@ import random
 
 # RSA 小指数 e=3 小消息教学演示：找回 m 使 m^3 ≡ c (mod N)，且 m < N^{1/3}
 # 经典用法：f(x) = x^3 - c，X ≈ N^{1/3}
+from coppersmith.instances import random_prime
 from coppersmith.univariate import find_small_roots_univariate
 
 
 def gen_small_rsa_modulus(bits: int = 36) -> int:
     # 生成小规模 N=p*q，仅为演示（非安全）。
-    def gen_prime(nbits: int) -> int:
-        from math import isqrt
-
-        def is_prime(n: int) -> bool:
-            if n < 2:
-                return False
-            if n % 2 == 0:
-                return n == 2
-            r = isqrt(n)
-            f = 3
-            while f <= r:
-                if n % f == 0:
-                    return False
-                f += 2
-            return True
-
-        while True:
-            x = random.getrandbits(nbits) | 1
-            if is_prime(x):
-                return x
-
-    p = gen_prime(bits // 2)
-    q = gen_prime(bits // 2)
+    p = random_prime(bits // 2)
+    q = random_prime(bits // 2)
     return p * q
 
 
@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 import random
-from math import isqrt
 
+from coppersmith.instances import random_prime
 from coppersmith.univariate import find_small_roots_univariate
 
 # 演示：构造一个小根 r，模数 N=p*q，二次多项式 f(x)=x^2 + c
@@ -11,31 +11,10 @@ from coppersmith.univariate import find_small_roots_univariate
 # 我们选取 |r| < X，期待算法找回 r。
 
 
-def gen_prime(bits: int) -> int:
-    # 简单试除法，教学演示足够
-    def is_prime(n: int) -> bool:
-        if n < 2:
-            return False
-        if n % 2 == 0:
-            return n == 2
-        r = isqrt(n)
-        f = 3
-        while f <= r:
-            if n % f == 0:
-                return False
-            f += 2
-        return True
-
-    while True:
-        n = random.getrandbits(bits) | 1
-        if is_prime(n):
-            return n
-
-
 def main() -> None:
     random.seed(42)
-    p = gen_prime(14)
-    q = gen_prime(14)
+    p = random_prime(14)
+    q = random_prime(14)
     N = p * q
 
     # 选择小根 r，界 X
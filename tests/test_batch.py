@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import random
+
+from coppersmith.batch import (
+    BivariateJob,
+    UnivariateJob,
+    factor_high_bits_guessing,
+    iter_solve,
+    run_job,
+    solve_all,
+)
+from coppersmith.instances import random_prime
+
+
+def _jobs() -> list[UnivariateJob | BivariateJob]:
+    random.seed(61)
+    N = random.getrandbits(64) | 1
+    X = 1 << 12
+    jobs: list[UnivariateJob | BivariateJob] = []
+    for _ in range(5):
+        r = random.randrange(-X + 1, X)
+        jobs.append(UnivariateJob((-pow(r, 3, N) % N, 0, 0, 1), N, X, m=2, t=2))
+    r, s = 7, 11
+    c = (-(r * r + s)) % N
+    jobs.append(BivariateJob.from_bivar({(2, 0): 1, (0, 1): 1, (0, 0): c}, N, 16, 16))
+    # 非法参数：作为单个任务的错误返回，不影响其他任务
+    jobs.append(UnivariateJob((1, 1), N, X, extraction="bogus"))
+    return jobs
+
+
+def test_pool_matches_inline_in_order() -> None:
+    jobs = _jobs()
+    inline = solve_all(jobs, max_workers=0)
+    pooled = solve_all(jobs, max_workers=2, chunksize=2)
+    assert [r.index for r in pooled] == list(range(len(jobs)))
+    assert [r.roots for r in pooled] == [r.roots for r in inline]
+    assert [r.roots for r in inline[:-1]] == [run_job(j) for j in jobs[:-1]]
+    assert inline[-1].roots is None and "bogus" in (inline[-1].error or "")
+    unordered = list(iter_solve(jobs, max_workers=2))
+    assert sorted(r.index for r in unordered) == list(range(len(jobs)))
+
+
+def test_per_job_timeout() -> None:
+    random.seed(62)
+    N = random.getrandbits(512) | 1
+    slow = UnivariateJob((random.randrange(N), random.randrange(N), 0, 1), N, 1 << 150, m=6, t=3)
+    (res,) = solve_all([slow], max_workers=1, timeout=0.2)
+    assert res.timed_out and res.roots is None and res.elapsed < 5
+
+
+def test_high_bits_guessing_finds_factor() -> None:
+    random.seed(63)
+    p = random_prime(22)
+    q = random_prime(22)
+    N = p * q
+    unknown, lattice = 10, 7
+    expect_guess = (p % (1 << unknown)) >> lattice
+    # 窗口互不重叠：报告的猜测与进程数、分块方式无关
+    for workers, chunksize in ((0, 1), (0, 8), (2, 1), (2, 3)):
+        hit = factor_high_bits_guessing(
+            N, p >> unknown, unknown, lattice, max_workers=workers, chunksize=chunksize
+        )
+        assert hit is not None and {hit.p, hit.q} == {p, q}
+        assert hit.guess == expect_guess
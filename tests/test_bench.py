@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from coppersmith.batch import run_job
+from coppersmith.bench import GridCell, grid, main, make_instance, percentile, run_grid
+
+
+def test_grid_overrides_and_validation() -> None:
+    cells = grid("rsa-e3", ("int", "fp"), x_bits=[40], m=[2], t=[1, 2])
+    assert len(cells) == 4
+    assert {(c.t, c.backend) for c in cells} == {(1, "int"), (1, "fp"), (2, "int"), (2, "fp")}
+    assert all(c.n_bits == 256 and c.x_bits == 40 for c in cells)
+    with pytest.raises(ValueError):
+        grid("rsa-e3", y_bits=[4])
+    with pytest.raises(ValueError):
+        grid("nope")
+
+
+def test_instances_are_seeded_and_solvable() -> None:
+    for cell in (
+        GridCell("rsa-e3", 128, 30, 2, 1),
+        GridCell("high-bits", 128, 16, 2, 3),
+        GridCell("bivar", 64, 4, 2, 2, y_bits=6, ty=2),
+    ):
+        job, root = make_instance(cell, 7, 0)
+        assert make_instance(cell, 7, 0) == (job, root)
+        assert make_instance(cell, 7, 1) != (job, root)
+        assert root in run_job(job)
+
+
+def test_percentile_nearest_rank() -> None:
+    assert percentile([], 50) == 0.0
+    values = [float(v) for v in range(1, 21)]
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile(values, 100) == 20.0
+
+
+def test_run_grid_and_cli_outputs(tmp_path: Path) -> None:
+    cells = [GridCell("high-bits", 128, 16, 2, 3), GridCell("bivar", 64, 4, 2, 2, 4, 2)]
+    results = run_grid(cells, trials=3, seed=1, max_workers=0)
+    assert [r.scenario for r in results] == ["high-bits", "bivar"]
+    assert [r.dim for r in results] == [5, 8]
+    assert all(r.successes == r.trials == 3 and r.success_rate == 1.0 for r in results)
+    assert all(0 < r.p50_ms <= r.p95_ms for r in results)
+
+    argv = ["--scenario", "rsa-e3", "--n-bits", "128", "--x-bits", "30", "--m", "2", "--t", "1"]
+    argv += ["--trials", "2", "--workers", "0"]
+    out_json = tmp_path / "scan.json"
+    assert main([*argv, "-o", str(out_json)]) == 0
+    rows = json.loads(out_json.read_text())
+    assert len(rows) == 1 and rows[0]["successes"] == 2 and rows[0]["dim"] == 7
+    out_csv = tmp_path / "scan.csv"
+    assert main([*argv, "--format", "csv", "-o", str(out_csv)]) == 0
+    with open(out_csv, newline="") as fh:
+        (row,) = list(csv.DictReader(fh))
+    assert row["scenario"] == "rsa-e3" and row["success_rate"] == "1.0"
@@ -1,43 +1,50 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import itertools
+import json
+import math
 import random
-from math import isqrt
+from fractions import Fraction
+from pathlib import Path
 
 import pytest
 
 from coppersmith.bivar import Bivar
-from coppersmith.bivariate import try_find_small_roots_bivar
+from coppersmith.bivariate import _recover_y, try_find_small_roots_bivar
+from coppersmith.instances import random_prime
+from coppersmith.lll import (
+    LLLProgress,
+    bkz_reduction,
+    howgrave_graham_bound2,
+    is_lll_reduced,
+    lll_deep_insertion,
+    lll_reduction,
+    lll_reduction_fp,
+    lll_reduction_int,
+    reduce_basis,
+    resume_lll,
+)
+from coppersmith.poly import eval_at, from_coeffs, integer_roots, mul, pow_poly
+from coppersmith.stats import SolveStats
 
 # 基础正确性与性能回归测试
-from coppersmith.univariate import find_small_roots_univariate
-
-
-def gen_prime(bits: int) -> int:
-    def is_prime(n: int) -> bool:
-        if n < 2:
-            return False
-        if n % 2 == 0:
-            return n == 2
-        r = isqrt(n)
-        f = 3
-        while f <= r:
-            if n % f == 0:
-                return False
-            f += 2
-        return True
-
-    while True:
-        x = random.getrandbits(bits) | 1
-        if is_prime(x):
-            return x
+from coppersmith.univariate import (
+    _build_lattice,
+    auto_parameters,
+    construct_lattice,
+    find_small_roots_univariate,
+    find_small_roots_univariate_batch,
+    precheck_univariate,
+    split_intervals,
+)
 
 
 @pytest.mark.parametrize("seed,bits,X", [(1, 14, 256), (2, 14, 256)])
 def test_univariate_small_root(seed: int, bits: int, X: int) -> None:
     random.seed(seed)
-    p = gen_prime(bits)
-    q = gen_prime(bits)
+    p = random_prime(bits)
+    q = random_prime(bits)
     N = p * q
     r = random.randrange(-X // 2, X // 2)
     c = (-(r * r)) % N
@@ -61,3 +68,305 @@ def test_bivariate_constructed_root() -> None:
     roots = try_find_small_roots_bivar(F, N=N, X=X, Y=Y, m=2, tx=2, ty=2)
     print({"case": "bivar", "N": N, "X": X, "Y": Y, "true": (r, s), "roots": roots[:10]})
     assert (r, s) in roots
+
+
+@pytest.mark.parametrize("seed", [3, 4, 5])
+def test_lll_int_matches_fraction(seed: int) -> None:
+    random.seed(seed)
+    n = random.randint(2, 6)
+    B = [[random.randint(-1000, 1000) for _ in range(n + 1)] for _ in range(n)]
+    assert lll_reduction_int(B) == lll_reduction(B)
+    # 线性相关输入：回退到 Fraction 版
+    dep = [[1, 2, 3], [2, 4, 6], [1, 0, 1]]
+    assert lll_reduction_int(dep) == lll_reduction(dep)
+    with pytest.raises(ValueError):
+        lll_reduction_int(dep, progress=lambda ev: None)
+    with pytest.raises(ValueError):
+        lll_reduction_int(dep, stats=SolveStats())
+
+
+@pytest.mark.parametrize("backend", ["fp", "fraction", "deep", "bkz"])
+def test_backends_find_roots(backend: str) -> None:
+    random.seed(11)
+    N = random_prime(14) * random_prime(14)
+    X = 256
+    r = random.randrange(-X // 2, X // 2)
+    roots = find_small_roots_univariate([(-(r * r)) % N, 0, 1], N=N, X=X, backend=backend)
+    assert r in roots
+    N = 499 * 547
+    F: Bivar = {(2, 0): 1, (0, 1): 1, (0, 0): (-(4 - 8)) % N}
+    assert (-2, -8) in try_find_small_roots_bivar(F, N=N, X=24, Y=24, backend=backend)
+
+
+def test_bkz_full_block_finds_shortest_vector() -> None:
+    # 块大小等于维度时 BKZ 第一条向量即最短向量：与小系数穷举比较
+    random.seed(13)
+    for n in (3, 4, 5):
+        B = [[random.randrange(-60, 60) for _ in range(n)] for _ in range(n)]
+        L = lll_reduction_fp(B)
+        shortest = min(
+            sum(v * v for v in vec)
+            for c in itertools.product(range(-3, 4), repeat=n)
+            if any(c)
+            for vec in [[sum(c[i] * L[i][j] for i in range(n)) for j in range(n)]]
+        )
+        R = bkz_reduction(B, block_size=n)
+        assert sum(v * v for v in R[0]) == shortest
+        D = lll_deep_insertion(B)
+        assert is_lll_reduced(D, Fraction(99, 100), Fraction(51, 100))
+        assert sum(v * v for v in D[0]) <= sum(v * v for v in L[0])
+
+
+def test_lll_fp_escalates_precision() -> None:
+    # 条目超出 double 范围，必须升精度（decimal）或回退精确版
+    random.seed(12)
+    big = 1 << 1500
+    B = [[big + random.randint(0, 1 << 700) for _ in range(4)] for _ in range(3)]
+    out = lll_reduction_fp(B)
+    assert is_lll_reduced(out, eta=Fraction(51, 100))
+    with pytest.raises(ValueError):
+        find_small_roots_univariate([1, 1], N=35, X=4, backend="nope")
+
+
+def test_integer_roots_hensel() -> None:
+    # (x-5)^3 (x+123456789012345) (3x-7)(x^2+1)：重根、大根、非整数有理根与无实根因子
+    p = mul(pow_poly({0: -5, 1: 1}, 3), {0: 123456789012345, 1: 1})
+    p = mul(mul(p, {0: -7, 1: 3}), {0: 1, 2: 1})
+    assert integer_roots(p) == [-123456789012345, 5]
+    assert integer_roots(p, bound=100) == [5]
+    assert integer_roots(mul(p, {2: 4})) == [-123456789012345, 0, 5]
+    with pytest.raises(ValueError):
+        integer_roots({})
+
+
+def test_univariate_rsa_small_e_1024() -> None:
+    # 1024 位模数，X ≈ N^{0.28}：根提取不再依赖 X 的大小
+    random.seed(2025)
+    N = random.getrandbits(1024) | (1 << 1023) | 1
+    X = 1 << 290
+    m_true = random.randrange(X)
+    f_coeffs = [-pow(m_true, 3, N), 0, 0, 1]
+    roots = find_small_roots_univariate(f_coeffs, N=N, X=X, m=3, t=2)
+    assert m_true in roots
+    assert all(eval_at(from_coeffs(f_coeffs), r) % N == 0 for r in roots)
+
+
+@pytest.mark.parametrize("seed", [21, 22])
+def test_extraction_strategies_agree(seed: int) -> None:
+    random.seed(seed)
+    N = random_prime(16) * random_prime(16)
+    X = 512
+    r = random.randrange(-X // 2, X // 2)
+    f_coeffs = [(-(r * r)) % N, 0, 1]
+    by_gcd = find_small_roots_univariate(f_coeffs, N=N, X=X, extraction="gcd")
+    by_rows = find_small_roots_univariate(f_coeffs, N=N, X=X, extraction="rows")
+    assert r in by_gcd
+    assert set(by_gcd) <= set(by_rows)
+    with pytest.raises(ValueError):
+        find_small_roots_univariate(f_coeffs, N=N, X=X, extraction="scan")
+
+
+def test_bivariate_highbits_direct_y() -> None:
+    # 已知 p 高位：F(x,y)=(p0+x)(q0+y)-N；y 由 G1/G2 在 x0 处的 gcd 直接求得，不再枚举 |y|<Y
+    random.seed(131)
+    b = 20
+    p = random_prime(b)
+    q = random_prime(b)
+    N = p * q
+    k = (b * 3) // 5
+    p0 = (p >> (b - k)) << (b - k)
+    q0 = N // p0
+    X = 1 << (b - k)
+    F: Bivar = {(1, 1): 1, (1, 0): q0, (0, 1): p0, (0, 0): p0 * q0 - N}
+    roots = try_find_small_roots_bivar(F, N=N, X=X, Y=4 * X)
+    assert (p - p0, q - q0) in roots
+
+
+def test_recover_y_when_g1_g2_vanish() -> None:
+    # G1、G2 在 x0 处恒为 0：改为直接解 F(x0, y)，不再列出全部 |y|<Y
+    N = 1000003 * 1000033
+    Y = 1 << 30
+    F: Bivar = {(2, 0): 1, (0, 1): 1, (0, 0): (-(5 * 5 + 123456)) % N}
+    assert _recover_y({}, {}, F, N, 5, Y) == [123456]
+    # 在 Z 上为零的模型（已知高位）：整数根即可
+    p0, q0 = 1000000, 1000000
+    G: Bivar = {(1, 1): 1, (1, 0): q0, (0, 1): p0, (0, 0): p0 * q0 - N}
+    assert 33 in _recover_y({}, {}, G, N, 3, Y)
+    assert _recover_y({}, {}, {(1, 0): N}, N, 1, 4) == [-3, -2, -1, 0, 1, 2, 3]
+
+
+def test_construct_lattice_cached_copies() -> None:
+    N = 1009 * 1013
+    f_coeffs = [5, 0, 0, 1]
+    before = _build_lattice.cache_info().hits
+    B1, n1 = construct_lattice(f_coeffs, N, 16, 3, 2)
+    B1[0][0] = -1  # 修改副本不影响缓存
+    B2, n2 = construct_lattice(f_coeffs, N, 16, 3, 2)
+    assert _build_lattice.cache_info().hits == before + 1
+    assert n1 == n2 and B2[0][0] == N**3
+
+
+def test_precheck_matches_diagonal_and_outcome() -> None:
+    random.seed(31)
+    N = random.getrandbits(64) | 1
+    for Xbits, expect in ((14, True), (20, False)):
+        X = 1 << Xbits
+        r = random.randrange(X // 2, X)
+        a, b = random.randrange(N), random.randrange(N)
+        f_coeffs = [(-(r**3 + a * r * r + b * r)) % N, b, a, 1]
+        pc = precheck_univariate(f_coeffs, N, X, 3, 2)
+        B, _ = construct_lattice(f_coeffs, N, X, 3, 2)
+        log2_diag = sum(math.log2(B[i][i]) for i in range(len(B)))
+        assert pc.dim == len(B) and abs(pc.log2_det - log2_diag) < 1e-6
+        assert pc.likely is expect
+        assert (r in find_small_roots_univariate(f_coeffs, N=N, X=X, m=3, t=2)) is expect
+
+
+def test_auto_parameters_escalate_only_when_needed() -> None:
+    random.seed(31)
+    N = random.getrandbits(64) | 1
+    for Xbits in (10, 16):
+        X = 1 << Xbits
+        r = random.randrange(X // 2, X)
+        a, b = random.randrange(N), random.randrange(N)
+        f_coeffs = [(-(r**3 + a * r * r + b * r)) % N, b, a, 1]
+        cands = auto_parameters(f_coeffs, N, X)
+        dims = [3 * m + t for m, t in cands]
+        assert dims == sorted(dims)
+        assert all(precheck_univariate(f_coeffs, N, X, m, t).likely for m, t in cands)
+        assert r in find_small_roots_univariate(f_coeffs, N=N, X=X, m="auto")
+
+
+def test_unknown_divisor_high_bits() -> None:
+    # p0+x ≡ 0 (mod p)，p | N 未知：单变量 beta 模式，X 可达约 N^{1/4}
+    random.seed(41)
+    b = 24
+    p = random_prime(b)
+    q = random_prime(b)
+    N = p * q
+    unk = 10
+    p0 = (p >> unk) << unk
+    X = 1 << unk
+    roots = find_small_roots_univariate([p0, 1], N=N, X=X, m="auto", beta=0.45)
+    assert p - p0 in roots
+    assert all(math.gcd(p0 + r, N) > 1 for r in roots)
+    # 非首一 f 会先在模 N 下化为首一
+    assert p - p0 in find_small_roots_univariate([3 * p0, 3], N=N, X=X, m=3, t=3, beta=0.45)
+
+
+@pytest.mark.parametrize(("warm_start", "early_stop"), [(True, True), (False, True), (True, False)])
+def test_batch_matches_single(warm_start: bool, early_stop: bool) -> None:
+    random.seed(51)
+    N = random.getrandbits(96) | 1
+    X = 1 << 24
+    rs = [random.randrange(-X + 1, X) for _ in range(8)]
+    polys = [[-pow(r, 3, N) % N, 0, 0, 1] for r in rs]
+    # 非常数部分不同的一项：走逐个构造的路径
+    a = random.randrange(N)
+    polys.append([(-(rs[0] ** 3 + a * rs[0])) % N, a, 0, 1])
+    got = find_small_roots_univariate_batch(
+        polys, N, X, m=2, t=2, warm_start=warm_start, early_stop=early_stop
+    )
+    assert got == [
+        find_small_roots_univariate(f, N, X, m=2, t=2, early_stop=early_stop) for f in polys
+    ]
+    assert all(rs[k % len(rs)] in got[k] for k in range(len(got)))
+    with pytest.raises(ValueError):
+        find_small_roots_univariate_batch([[1, 1], [1, 0, 1]], N, X)
+
+
+def test_split_intervals_recover_roots_beyond_single_lattice() -> None:
+    random.seed(71)
+    N = random.getrandbits(64) | 1
+    X = 1 << 17
+    for _ in range(3):
+        r = random.choice((-1, 1)) * random.randrange(X // 2, X)
+        a, b = random.randrange(N), random.randrange(N)
+        f_coeffs = [(-(r**3 + a * r * r + b * r)) % N, b, a, 1]
+        roots = find_small_roots_univariate(f_coeffs, N, X, m=2, t=2, split=4)
+        assert r in roots and all(abs(x) < X for x in roots)
+    pooled = find_small_roots_univariate(f_coeffs, N, X, m=2, t=2, split=4, max_workers=2)
+    assert pooled == roots
+    for k in (1, 3, 8):
+        covered = set()
+        for c, half in split_intervals(X // 1024, k):
+            covered.update(range(c - half + 1, c + half))
+        assert set(range(-X // 1024 + 1, X // 1024)) <= covered
+
+
+@pytest.mark.parametrize("backend", ["int", "fp"])
+def test_early_stop_hook(backend: str) -> None:
+    random.seed(81)
+    N = random.getrandbits(64) | 1
+    X = 1 << 12
+    r = random.randrange(X // 2, X)
+    a, b = random.randrange(N), random.randrange(N)
+    f_coeffs = [(-(r**3 + a * r * r + b * r)) % N, b, a, 1]
+    B, _ = construct_lattice(f_coeffs, N, X, 3, 2)
+    bound2 = howgrave_graham_bound2(N, 3, len(B))
+    calls: list[int] = []
+
+    def hook(rows: list[list[int]], k: int) -> bool:
+        calls.append(k)
+        return sum(v * v for v in rows[0]) < bound2
+
+    out = reduce_basis(B, backend, stop=hook)
+    assert calls and calls[-1] < len(B)
+    assert sum(v * v for v in out[0]) < bound2
+    full = find_small_roots_univariate(f_coeffs, N, X, 3, 2, backend, early_stop=False)
+    assert r in full
+    assert find_small_roots_univariate(f_coeffs, N, X, 3, 2, backend) == full
+
+
+def test_lll_progress_and_checkpoint_resume(tmp_path: Path) -> None:
+    random.seed(91)
+    N = random.getrandbits(64) | 1
+    f_coeffs = [random.randrange(N) for _ in range(3)] + [1]
+    B, _ = construct_lattice(f_coeffs, N, 1 << 16, 3, 2)
+    full = lll_reduction_int(B)
+
+    class Preempted(Exception):
+        pass
+
+    events: list[LLLProgress] = []
+
+    def report(ev: LLLProgress) -> None:
+        events.append(ev)
+        if ev.swaps >= 60:
+            raise Preempted
+
+    ckpt = tmp_path / "lll.json"
+    with pytest.raises(Preempted):
+        lll_reduction_int(B, progress=report, report_every=20, checkpoint=ckpt, checkpoint_every=25)
+    pots = [ev.log2_potential for ev in events]
+    assert [ev.swaps for ev in events] == [20, 40, 60]
+    assert pots == sorted(pots, reverse=True) and len(events[0].profile) == len(B)
+    # 断点停在第 50 次交换；续算结果与一次性约化完全一致
+    assert resume_lll(ckpt) == full
+    assert resume_lll(ckpt) == full  # 已完成的断点直接返回
+
+
+def test_solve_stats_instrumentation() -> None:
+    random.seed(5)
+    N = random.getrandbits(64) | 1
+    r = 1234
+    f = [random.randrange(N) for _ in range(3)] + [1]
+    f[0] = (f[0] - eval_at(from_coeffs(f), r)) % N
+    stats = SolveStats()
+    assert find_small_roots_univariate(f, N, 1 << 14, 2, 1, stats=stats) == [r]
+    assert set(stats.seconds) == {"construct", "reduce", "extract"}
+    assert stats.counts["attempts"] == 1 and stats.counts["lattice_rows"] == 7
+    assert stats.counts["lll_swaps"] > 0 and stats.counts["lll_size_reductions"] > 0
+    assert stats.bits["N"] == N.bit_length() and stats.bits["lattice_out"] > 0
+    # 分段模式：各窗口的统计合并到同一对象
+    split_stats = SolveStats()
+    find_small_roots_univariate(f, N, 1 << 14, 2, 1, split=3, stats=split_stats)
+    assert split_stats.counts["windows"] == split_stats.counts["attempts"] == 3
+
+    N = 499 * 547
+    F: Bivar = {(2, 0): 1, (0, 1): 1, (0, 0): (-(4 - 8)) % N}
+    stats = SolveStats()
+    assert (-2, -8) in try_find_small_roots_bivar(F, N=N, X=24, Y=24, stats=stats)
+    assert set(stats.seconds) == {"construct", "reduce", "resultant", "extract"}
+    assert stats.counts["resultant_samples"] > 0 and stats.counts["resultant_primes"] > 0
+    assert json.loads(stats.to_json())["counts"] == stats.counts
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import random
+from fractions import Fraction
+
+import pytest
+
+from coppersmith.elimination import (
+    BivarFrac,
+    eval_int_poly,
+    lagrange_interpolate,
+    newton_interpolate,
+    resultant_in_x,
+    resultant_in_x_by_interpolation,
+    resultant_in_x_modular,
+    resultant_in_x_subresultant,
+    resultant_int_y,
+    resultant_subresultant,
+    resultant_univar_mod,
+)
+
+# 结果式各实现的一致性测试
+
+
+def rand_bivar_frac(dx: int, dy: int, den: int) -> BivarFrac:
+    return {
+        (i, j): Fraction(random.randint(-99, 99), random.randint(1, den))
+        for i in range(dx + 1)
+        for j in range(dy + 1)
+    }
+
+
+def same_up_to_sign(a: list[int], b: list[int]) -> bool:
+    return a == b or a == [-c for c in b]
+
+
+@pytest.mark.parametrize("seed,deg,den", [(1, 1, 1), (2, 2, 1), (3, 3, 5), (4, 4, 3)])
+def test_modular_matches_interpolation(seed: int, deg: int, den: int) -> None:
+    random.seed(seed)
+    G1 = rand_bivar_frac(deg, deg, den)
+    G2 = rand_bivar_frac(deg, deg - 1 if deg > 1 else 1, den)
+    R_mod = resultant_in_x_modular(G1, G2, 20, 20)
+    R_int = resultant_in_x_by_interpolation(G1, G2, 20, 20)
+    assert same_up_to_sign(R_mod, R_int)
+    assert same_up_to_sign(resultant_in_x(G1, G2, 20, 20), R_mod)
+    assert same_up_to_sign(resultant_in_x_subresultant(G1, G2, 20, 20), R_mod)
+
+
+def test_modular_resultant_exact_values() -> None:
+    # G1 = y - x^2 - 1, G2 = y^2 - 2：Res_y = (x^2+1)^2 - 2
+    G1: BivarFrac = {(0, 1): Fraction(1), (2, 0): Fraction(-1), (0, 0): Fraction(-1)}
+    G2: BivarFrac = {(0, 2): Fraction(1), (0, 0): Fraction(-2)}
+    R = resultant_in_x_modular(G1, G2, 4, 4)
+    assert same_up_to_sign(R, [-1, 0, 2, 0, 1])
+    for x0 in range(-3, 4):
+        p = [-(x0 * x0) - 1, 1]
+        assert abs(resultant_int_y(p, [-2, 0, 1])) == abs(eval_int_poly(R, x0))
+    with pytest.raises(ValueError):
+        resultant_in_x(G1, G2, 4, 4, method="magic")
+
+
+def test_subresultant_exact_sign() -> None:
+    # Res_y(y-3, y-5) = -2；Res_y(y^2-9, y-5) = 16；Res_y(y-x^2-1, y^2-2) = x^4+2x^2-1
+    assert resultant_subresultant({(0, 1): 1, (0, 0): -3}, {(0, 1): 1, (0, 0): -5}) == {0: -2}
+    assert resultant_subresultant({(0, 2): 1, (0, 0): -9}, {(0, 1): 1, (0, 0): -5}) == {0: 16}
+    A = {(0, 1): 1, (2, 0): -1, (0, 0): -1}
+    B = {(0, 2): 1, (0, 0): -2}
+    assert resultant_subresultant(A, B) == {4: 1, 2: 2, 0: -1}
+
+
+def test_resultant_univar_mod_matches_sylvester() -> None:
+    # resultant_int_y 的 Sylvester 行按升幂排列，与标准定义差 (-1)^{deg a·deg b}
+    random.seed(3)
+    p = (1 << 61) - 1
+    for _ in range(200):
+        da, db = random.randint(0, 6), random.randint(0, 6)
+        a = [random.randint(-50, 50) for _ in range(da)] + [random.choice([1, -3, 7])]
+        b = [random.randint(-50, 50) for _ in range(db)] + [random.choice([2, -1, 5])]
+        expect = (-1) ** (da * db) * resultant_int_y(a, b) % p
+        assert resultant_univar_mod(a, b, p) == expect
+
+
+@pytest.mark.parametrize("seed", [5, 6, 7])
+def test_newton_interpolate_matches_lagrange(seed: int) -> None:
+    random.seed(seed)
+    n = random.randint(2, 12)
+    xs = random.sample(range(-40, 40), n)
+    coeffs = [random.getrandbits(80) - (1 << 79) for _ in range(n)]
+    integral = [(x, eval_int_poly(coeffs, x)) for x in xs]
+    assert newton_interpolate(integral) == lagrange_interpolate(integral)
+    # 非整数系数的插值多项式：回退路径同样一致
+    rational = [(x, random.randint(-50, 50)) for x in xs]
+    assert newton_interpolate(rational) == lagrange_interpolate(rational)
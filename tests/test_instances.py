@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from coppersmith.bivar import eval_at as eval_bivar
+from coppersmith.bivariate import try_find_small_roots_bivar
+from coppersmith.instances import (
+    CACHE_ENV,
+    _rsa_modulus_memo,
+    cache_dir,
+    hastad_broadcast,
+    is_probable_prime,
+    partial_p_bits,
+    random_prime,
+    rsa_modulus,
+    small_e_message,
+    stereotyped_message,
+)
+from coppersmith.poly import eval_at, from_coeffs
+from coppersmith.univariate import find_small_roots_univariate
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # 不写用户的 ~/.cache；清空内存缓存，确保磁盘路径被走到
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path))
+    _rsa_modulus_memo.cache_clear()
+    return tmp_path
+
+
+def test_is_probable_prime() -> None:
+    sieve = [True] * 2000
+    sieve[0] = sieve[1] = False
+    for i in range(2, 2000):
+        if sieve[i]:
+            for j in range(i * i, 2000, i):
+                sieve[j] = False
+    assert [n for n in range(2000) if is_probable_prime(n)] == [n for n in range(2000) if sieve[n]]
+    # Carmichael 数与强伪素数（对前若干个底）
+    for n in (561, 41041, 825265, 3215031751, 3825123056546413051):
+        assert not is_probable_prime(n)
+    assert is_probable_prime((1 << 127) - 1)
+    assert not is_probable_prime(((1 << 61) - 1) * ((1 << 89) - 1))
+
+
+def test_random_prime_bits_and_seeding() -> None:
+    rng = random.Random(5)
+    for bits in (2, 3, 17, 64, 300):
+        p = random_prime(bits, rng)
+        assert p.bit_length() == bits and is_probable_prime(p)
+    random.seed(9)
+    a = random_prime(40)
+    random.seed(9)
+    assert random_prime(40) == a
+    with pytest.raises(ValueError):
+        random_prime(1)
+
+
+def test_rsa_modulus_deterministic_and_cached(tmp_cache: Path) -> None:
+    small = rsa_modulus(64, seed=3, e=3)
+    assert small.N.bit_length() == 64 and small.p * small.q == small.N
+    assert small.p < small.q and (small.p - 1) % 3 and (small.q - 1) % 3
+    assert rsa_modulus(64, seed=3, e=3) == small
+    assert rsa_modulus(64, seed=4, e=3) != small
+    assert not any(tmp_cache.iterdir())
+
+    key = rsa_modulus(256, seed="a")
+    assert cache_dir() == tmp_cache
+    (path,) = tmp_cache.iterdir()
+    assert json.loads(path.read_text(encoding="utf-8"))["N"] == key.N
+    _rsa_modulus_memo.cache_clear()
+    assert rsa_modulus(256, seed="a") == key
+    assert _rsa_modulus_memo.cache_info().misses == 0
+    # 损坏的缓存文件被忽略并重写
+    path.write_text("{", encoding="utf-8")
+    assert rsa_modulus(256, seed="a") == key
+    assert json.loads(path.read_text(encoding="utf-8"))["p"] == key.p
+    with pytest.raises(ValueError):
+        rsa_modulus(64, e=4)
+    # 边界：4 位取不到，5 位只有 21 = 3·7；e=3 时 8 位及以下均无解
+    with pytest.raises(ValueError):
+        rsa_modulus(4)
+    assert rsa_modulus(5).N == 21 and rsa_modulus(5, e=7).N == 21
+    for bits in (5, 8):
+        with pytest.raises(ValueError):
+            rsa_modulus(bits, e=3)
+    assert rsa_modulus(9, e=3).N.bit_length() == 9
+
+
+def test_scenarios_are_solvable() -> None:
+    inst = small_e_message(256, e=3)
+    assert inst.m < inst.X and pow(inst.m, 3, inst.N) == inst.c
+    assert inst.m in find_small_roots_univariate(inst.poly(), inst.N, inst.X)
+
+    pp = partial_p_bits(256, 40, seed=1)
+    assert pp.p0 + (pp.p - pp.p0) == pp.p and pp.p - pp.p0 < pp.X
+    assert pp.p - pp.p0 in find_small_roots_univariate(pp.poly(), pp.N, pp.X, beta=pp.beta)
+    assert eval_bivar(pp.bivar(), pp.p - pp.p0, pp.q - pp.N // pp.p0) == 0
+
+    st = stereotyped_message(256, 40, seed=2)
+    assert eval_at(from_coeffs(st.poly()), st.x) % st.N == 0
+    assert st.x in find_small_roots_univariate(st.poly(), st.N, st.X)
+
+    hb = hastad_broadcast(64, e=3, seed=3)
+    assert len(set(hb.moduli)) == 3 and hb.m < min(hb.moduli)
+    assert all(pow(hb.m, 3, N) == hb.ciphertexts[i] for i, N in enumerate(hb.moduli))
+    with pytest.raises(ValueError):
+        partial_p_bits(64, 32)
+
+
+def test_partial_p_bits_bivariate() -> None:
+    pp = partial_p_bits(40, 8, seed=4)
+    roots = try_find_small_roots_bivar(pp.bivar(), N=pp.N, X=pp.X, Y=4 * pp.X)
+    assert (pp.p - pp.p0, pp.q - pp.N // pp.p0) in roots
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from coppersmith.bivar import (
+    Bivar,
+    mul as bivar_mul,
+    mul_dict,
+    mul_kronecker as bivar_mul_kronecker,
+    pow_bivar,
+)
+from coppersmith.poly import (
+    DensePoly,
+    eval_at,
+    from_coeffs,
+    mul,
+    mul_karatsuba,
+    mul_kronecker,
+    mul_schoolbook,
+    normalize,
+    pow_poly,
+    taylor_shift,
+)
+
+# 稠密多项式乘法：各算法与 dict 版兼容层的一致性
+
+
+@pytest.mark.parametrize("seed,n,bits", [(1, 5, 16), (2, 40, 64), (3, 70, 300)])
+def test_dense_mul_algorithms_agree(seed: int, n: int, bits: int) -> None:
+    random.seed(seed)
+    a = [random.getrandbits(bits) - (1 << (bits - 1)) for _ in range(n)]
+    b = [random.getrandbits(bits) - (1 << (bits - 1)) for _ in range(n + 3)]
+    ref = mul_schoolbook(a, b)
+    assert mul_karatsuba(a, b) == ref
+    assert mul_kronecker(a, b) == ref
+    assert (DensePoly(a) * DensePoly(b)).coeffs == DensePoly(ref).coeffs
+
+
+def test_dict_api_uses_dense_path() -> None:
+    random.seed(4)
+    f = from_coeffs([random.getrandbits(512) - (1 << 511) for _ in range(20)])
+    g = from_coeffs([random.randint(-5, 5) for _ in range(40)])
+    ref: dict[int, int] = {}
+    for i, fi in f.items():
+        for j, gj in g.items():
+            ref[i + j] = ref.get(i + j, 0) + fi * gj
+    assert mul(f, g) == normalize(ref)
+    assert (DensePoly.from_dict(f) ** 5).to_dict() == pow_poly(f, 5)
+    assert DensePoly([1, 2, 1])(3) == 16
+
+
+@pytest.mark.parametrize("seed,bits", [(5, 8), (6, 200)])
+def test_bivar_kronecker_matches_dict(seed: int, bits: int) -> None:
+    random.seed(seed)
+    F: Bivar = {
+        (1, 1): 1,
+        (1, 0): random.getrandbits(bits),
+        (0, 1): -random.getrandbits(bits),
+        (0, 0): random.getrandbits(2 * bits) - (1 << (2 * bits - 1)),
+    }
+    G: Bivar = {(2, 0): 1, (0, 1): -1, (0, 0): random.getrandbits(bits)}
+    for a, b in ((F, G), (pow_bivar(F, 4), pow_bivar(G, 3)), ({}, F)):
+        assert bivar_mul_kronecker(a, b) == mul_dict(a, b)
+    # 稠密小系数：bivar.mul 走 Kronecker 路径
+    D: Bivar = {(i, j): random.randint(-(1 << 30), 1 << 30) for i in range(6) for j in range(6)}
+    assert bivar_mul(D, D) == mul_dict(D, D)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_taylor_shift_matches_evaluation(seed: int) -> None:
+    random.seed(seed)
+    a = from_coeffs([random.randrange(-(1 << 40), 1 << 40) for _ in range(9)])
+    c = random.randrange(-(1 << 20), 1 << 20)
+    b = taylor_shift(a, c)
+    assert all(eval_at(b, x) == eval_at(a, x + c) for x in range(-6, 7))
+    assert taylor_shift(b, -c) == a